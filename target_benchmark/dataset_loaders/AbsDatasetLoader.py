@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Literal, Tuple
+from typing import Any, Dict, Iterable, List, Literal, Tuple
 
-from datasets import Dataset
+from datasets import Dataset, IterableDataset
 
 from target_benchmark.dataset_loaders.utils import (
     InMemoryDataFormat,
@@ -47,7 +48,7 @@ class AbsDatasetLoader(ABC):
 
             split (Literal["test", "train", "validation"], optional): split of the data you want to load. defaults to test, since some models may use the train split of existing datasets for training, we opt to use test for our evaluation purposes.
 
-            data_directory (str, optional): a directory where data files are stored. you don't have to provide one if you don't need to persist the file after loading it.
+            data_directory (str, optional): a directory where data files are stored. you don't have to provide one if you don't need to persist the file after loading it. when provided, it is also used as the huggingface datasets cache, so point it at your fastest local disk.
 
             query_type (str, optional): the type of queries that the dataset focuses on, for example fact verification, table QA, text to sql, etc. defaults to None.
 
@@ -67,12 +68,32 @@ class AbsDatasetLoader(ABC):
         self.query_type: QueryType = set_query_type(query_type)
         self.corpus: Dataset = None
         self.queries: Dataset = None
+        # memoized `get_table_id_to_table` result, with the corpus object it was built from
+        self._table_id_to_table: Tuple[object, Dict[Tuple[str, str], List[List]]] = None
 
     def load(self) -> None:
+        load_fns = []
         if not self.corpus:
-            self._load_corpus()
+            load_fns.append(self._load_corpus)
         if not self.queries:
-            self._load_queries()
+            load_fns.append(self._load_queries)
+        if not load_fns:
+            return
+        # corpus and queries are separate downloads, overlap the network & disk round trips.
+        with ThreadPoolExecutor(max_workers=len(load_fns)) as executor:
+            futures = [executor.submit(load_fn) for load_fn in load_fns]
+            for future in futures:
+                future.result()
+
+    def _get_load_dataset_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments shared by all `load_dataset` calls of the loader.
+        Datasets are always memory mapped from the arrow cache instead of being copied into RAM.
+        """
+        load_kwargs = {"keep_in_memory": False}
+        if self.data_directory:
+            load_kwargs["cache_dir"] = self.data_directory
+        return load_kwargs
 
     @abstractmethod
     def _load_corpus(self) -> None:
@@ -141,6 +162,14 @@ class AbsDatasetLoader(ABC):
 
         in_memory_format = set_in_memory_data_format(output_format)
 
+        count_tables = num_tables or self.num_tables
+        if isinstance(self.corpus, IterableDataset) and count_tables is not None:
+            raise ValueError("Randomly selecting `num_tables` tables is not supported for streamed corpora!")
+        if count_tables is None and isinstance(self.corpus, (Dataset, IterableDataset)):
+            # read the arrow table batch by batch instead of converting the whole corpus to python objects
+            yield from self._convert_corpus_table_batches_to(in_memory_format, batch_size)
+            return
+
         converted_corpus = self._convert_corpus_to_dict()
 
         if in_memory_format == InMemoryDataFormat.DF:
@@ -149,7 +178,6 @@ class AbsDatasetLoader(ABC):
         elif in_memory_format == InMemoryDataFormat.DICTIONARY:
             dict_tables = list(map(array_of_arrays_to_dict, self.corpus[TABLE_COL_NAME]))
             converted_corpus[TABLE_COL_NAME] = dict_tables
-        count_tables = num_tables or self.num_tables
         if count_tables is not None:
             converted_corpus = get_random_tables(converted_corpus, max(0, min(count_tables, self.get_corpus_size())))
         for i in range(0, len(converted_corpus[TABLE_COL_NAME]), batch_size):
@@ -161,9 +189,38 @@ class AbsDatasetLoader(ABC):
             batch[CONTEXT_COL_NAME] = converted_corpus[CONTEXT_COL_NAME][i : i + batch_size]
             yield batch
 
+    def _convert_corpus_table_batches_to(
+        self,
+        in_memory_format: InMemoryDataFormat,
+        batch_size: int,
+    ) -> Iterable[Dict]:
+        """
+        convert the corpus batch by batch, without materializing the whole corpus in memory.
+        works for both memory mapped and streamed corpora, only one batch is turned into python objects at a time.
+        """
+        for batch in self.corpus.iter(batch_size=batch_size):
+            tables = batch[TABLE_COL_NAME]
+            if in_memory_format == InMemoryDataFormat.DF:
+                tables = list(map(array_of_arrays_to_df, tables))
+            elif in_memory_format == InMemoryDataFormat.DICTIONARY:
+                tables = list(map(array_of_arrays_to_dict, tables))
+            yield {
+                TABLE_COL_NAME: tables,
+                DATABASE_ID_COL_NAME: batch[DATABASE_ID_COL_NAME],
+                TABLE_ID_COL_NAME: batch[TABLE_ID_COL_NAME],
+                CONTEXT_COL_NAME: batch[CONTEXT_COL_NAME],
+            }
+
     def get_table_id_to_table(
         self,
     ) -> Dict[Tuple[str, str], List[List]]:
+        """
+        maps each (database id, table id) of the corpus to its table. the mapping is built once per loaded corpus
+        and shared by every task run on this loader, so don't modify the returned dictionary.
+        """
+        cached = getattr(self, "_table_id_to_table", None)
+        if cached is not None and cached[0] is self.corpus:
+            return cached[1]
         mapping_dict = {}
         for entry in self.convert_corpus_table_to():
             for database_id, table_id, table in zip(
@@ -173,6 +230,7 @@ class AbsDatasetLoader(ABC):
             ):
                 key = (str(database_id), str(table_id))
                 mapping_dict[key] = table
+        self._table_id_to_table = (self.corpus, mapping_dict)
         return mapping_dict
 
     def get_queries_for_task(self, batch_size: int = 64, start_idx: int = 0) -> Iterable[Dict]:
@@ -217,6 +275,12 @@ class AbsDatasetLoader(ABC):
         """
         if not self.corpus:
             raise RuntimeError("Corpus datasets have not been loaded!")
+        if isinstance(self.corpus, IterableDataset):
+            # streamed datasets don't know their length, fall back to the split metadata
+            splits = self.corpus.info.splits
+            if not splits or self.split not in splits:
+                raise RuntimeError("Size of the streamed corpus is not available in the dataset metadata!")
+            return splits[self.split].num_examples
         return self.corpus.num_rows
 
     def get_queries(self) -> Dataset:
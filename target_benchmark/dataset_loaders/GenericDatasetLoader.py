@@ -1,10 +1,13 @@
 from pathlib import Path
-from typing import Literal
+from typing import Any, Dict, Literal
 
-from datasets import DatasetDict, load_dataset
+from datasets import load_dataset
 
 from target_benchmark.dataset_loaders.AbsDatasetLoader import AbsDatasetLoader
 
+# keyword arguments forwarded to `load_dataset` when loading the corpus
+LOAD_DATASET_KWARGS = ("streaming", "filters", "num_proc", "keep_in_memory")
+
 
 class GenericDatasetLoader(AbsDatasetLoader):
     def __init__(
@@ -31,27 +34,37 @@ class GenericDatasetLoader(AbsDatasetLoader):
                     ├── train.csv
                     └── test.csv
             Dataset file formats supported: csv, json, parquet, etc
+
+            **kwargs: `streaming`, `filters`, `num_proc` and `keep_in_memory` are forwarded to `load_dataset` when loading the corpus.
         """
         super().__init__(
             dataset_name=dataset_name,
             split=split,
             data_directory=data_directory,
             query_type=query_type,
-            num_tables=num_tables**kwargs,
+            num_tables=num_tables,
+            **kwargs,
         )
         self.dataset_path = Path(dataset_path)
         self.corpus_path = self.dataset_path / "corpus"
         self.queries_path = self.dataset_path / "queries"
         self.datafile_ext = datafile_ext
+        self._load_kwargs: Dict[str, Any] = {
+            key: kwargs[key] for key in LOAD_DATASET_KWARGS if kwargs.get(key) is not None
+        }
 
     def _load_corpus(self) -> None:
         if not self.corpus:
-            self.corpus = DatasetDict()
-        if self.split not in self.corpus:
-            self.corpus[self.split] = load_dataset(path=str(self.corpus_path), split=self.split)
+            self.corpus = load_dataset(
+                path=str(self.corpus_path),
+                split=self.split,
+                **{**self._get_load_dataset_kwargs(), **self._load_kwargs},
+            )
 
     def _load_queries(self) -> None:
         if not self.queries:
-            self.queries = DatasetDict()
-        if self.split not in self.queries:
-            self.queries[self.split] = load_dataset(path=str(self.queries_path), split=self.split)
+            self.queries = load_dataset(
+                path=str(self.queries_path),
+                split=self.split,
+                **self._get_load_dataset_kwargs(),
+            )
@@ -1,9 +1,31 @@
-from typing import Literal
+import os
+from typing import Any, Dict, List, Literal, Tuple, Union
 
-from datasets import load_dataset
+from datasets import Dataset, IterableDataset, load_dataset
 
 from target_benchmark.dataset_loaders.AbsDatasetLoader import AbsDatasetLoader
 
+# datasets loaded in this process, shared by all loader instances.
+# huggingface datasets are immutable memory mapped views, so sharing them is safe.
+_loaded_datasets: Dict[Tuple[str, str, str], Union[Dataset, IterableDataset]] = {}
+
+
+def _cached_load_dataset(path: str, split: str, **load_kwargs) -> Union[Dataset, IterableDataset]:
+    """
+    `load_dataset`, memoized on its arguments for the lifetime of the process.
+    """
+    key = (path, split, repr(sorted(load_kwargs.items())))
+    if key not in _loaded_datasets:
+        _loaded_datasets[key] = load_dataset(path=path, split=split, **load_kwargs)
+    return _loaded_datasets[key]
+
+
+def invalidate_cache() -> None:
+    """
+    Drop all datasets memoized by `_cached_load_dataset`.
+    """
+    _loaded_datasets.clear()
+
 
 class HFDatasetLoader(AbsDatasetLoader):
     def __init__(
@@ -15,6 +37,9 @@ class HFDatasetLoader(AbsDatasetLoader):
         split: Literal["test", "train", "validation"] = "test",
         data_directory: str = None,
         query_type: str = "",
+        streaming: bool = False,
+        filters: List = None,
+        num_proc: int = None,
         **kwargs
     ):
         super().__init__(
@@ -30,15 +55,40 @@ class HFDatasetLoader(AbsDatasetLoader):
         Parameters:
             hf_corpus_dataset_path (str): the path to your huggingface hub corpus dataset. it will look something like target-benchmark/fetaqa-corpus (namespace/dataset-name)
             hf_queries_dataset_path (str): the path to your huggingface hub queries dataset path.
+            streaming (bool, optional): whether to stream the corpus dataset instead of loading it eagerly. defaults to False.
+            filters (List, optional): row filters pushed down to the parquet files of the corpus dataset. defaults to None.
+            num_proc (int, optional): number of processes to load the corpus dataset shards with. defaults to None, a single process.
         """
 
         self.hf_corpus_dataset_path = hf_corpus_dataset_path
         self.hf_queries_dataset_path = hf_queries_dataset_path
+        self.streaming = streaming
+        self.filters = filters
+        self.num_proc = num_proc
+
+    def _get_corpus_load_kwargs(self) -> Dict[str, Any]:
+        load_kwargs = self._get_load_dataset_kwargs()
+        load_kwargs["streaming"] = self.streaming
+        # only forward filters when set, older `datasets` versions reject the argument
+        if self.filters:
+            load_kwargs["filters"] = self.filters
+        # shards are mmap'd in parallel, huggingface caps the workers at the number of shards
+        if self.num_proc and not self.streaming:
+            load_kwargs["num_proc"] = min(self.num_proc, os.cpu_count() or 1)
+        return load_kwargs
 
     def _load_corpus(self) -> None:
         if not self.corpus:
-            self.corpus = load_dataset(path=self.hf_corpus_dataset_path, split=self.split)
+            self.corpus = _cached_load_dataset(
+                path=self.hf_corpus_dataset_path,
+                split=self.split,
+                **self._get_corpus_load_kwargs(),
+            )
 
     def _load_queries(self) -> None:
         if not self.queries:
-            self.queries = load_dataset(path=self.hf_queries_dataset_path, split=self.split)
+            self.queries = _cached_load_dataset(
+                path=self.hf_queries_dataset_path,
+                split=self.split,
+                **self._get_load_dataset_kwargs(),
+            )
@@ -1,4 +1,4 @@
-from typing import Dict, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -20,7 +20,7 @@ class DatasetConfigDataModel(BaseModel):
     )
     data_directory: Optional[str] = Field(
         default=None,
-        description="directory for where to persist the data to. defaults to None.",
+        description="directory for where to persist the data to, also used as the huggingface datasets cache directory. defaults to None.",
     )
 
     query_type: Optional[
@@ -36,7 +36,7 @@ class GenericDatasetConfigDataModel(DatasetConfigDataModel):
     """
 
     dataset_path: str = Field(description="Path to the local dataset directory.")
-    datafile_ext: str = (Field(default=None, description="File type of the dataset. csv, tsv, etc."),)
+    datafile_ext: Optional[str] = Field(default=None, description="File type of the dataset. csv, tsv, etc.")
 
 
 class HFDatasetConfigDataModel(DatasetConfigDataModel):
@@ -52,6 +52,21 @@ class HFDatasetConfigDataModel(DatasetConfigDataModel):
         description="A huggingface dataset path to the query dataset. It will look something like target-benchmark/fetaqa-queries (namespace/queries-dataset-name)"
     )
 
+    streaming: bool = Field(
+        default=False,
+        description="Whether to stream the corpus dataset instead of loading it eagerly. Streamed corpora are iterated once and never fully materialized in memory. Random table sampling via `num_tables` is not available for streamed corpora.",
+    )
+
+    filters: Optional[List] = Field(
+        default=None,
+        description="Row filters pushed down to the parquet files of the corpus dataset, in pyarrow's DNF format, ie [('database_id', '=', 'db')]. Requires datasets>=3.2.",
+    )
+
+    num_proc: Optional[int] = Field(
+        default=None,
+        description="Number of processes used to download and prepare the shards of the corpus dataset in parallel. Capped at the number of shards by huggingface. Ignored when streaming. Defaults to a single process.",
+    )
+
 
 class NeedleInHaystackDatasetConfigDataModel(HFDatasetConfigDataModel):
     query_type: str = "Needle in Haystack"
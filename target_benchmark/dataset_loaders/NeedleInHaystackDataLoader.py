@@ -14,6 +14,8 @@ class NeedleInHaystackDataLoader(HFDatasetLoader):
         data_directory: str = None,
         **kwargs,
     ):
+        # the query type is fixed for this loader, configs carry their own which is ignored here
+        kwargs.pop("query_type", None)
         super().__init__(
             dataset_name=dataset_name,
             hf_corpus_dataset_path=hf_corpus_dataset_path,
@@ -22,7 +24,7 @@ class NeedleInHaystackDataLoader(HFDatasetLoader):
             split=split,
             data_directory=data_directory,
             query_type="Other",
-            kwargs=kwargs,
+            **kwargs,
         )
 
     def _load_queries(self) -> None:
@@ -30,6 +30,8 @@ class Text2SQLDatasetLoader(HFDatasetLoader):
                 "we don't allow customized text2sql datasets yet. try one of the splits of spider or bird instead"
             )
 
+        # the query type is fixed for this loader, configs carry their own which is ignored here
+        kwargs.pop("query_type", None)
         super().__init__(
             dataset_name=dataset_name,
             hf_corpus_dataset_path=hf_corpus_dataset_path,
@@ -38,7 +40,7 @@ class Text2SQLDatasetLoader(HFDatasetLoader):
             split=split,
             data_directory=data_directory,
             query_type="Text to SQL",
-            kwargs=kwargs,
+            **kwargs,
         )
         self.corpus: Dict = None
         self.path_to_database_dir: str = None
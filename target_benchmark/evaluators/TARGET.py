@@ -11,6 +11,7 @@ from qdrant_client import QdrantClient, models
 from tqdm import tqdm
 
 from target_benchmark.dataset_loaders import (
+    GenericDatasetLoader,
     HFDatasetLoader,
     NeedleInHaystackDataLoader,
     Text2SQLDatasetLoader,
@@ -257,7 +258,7 @@ class TARGET:
             elif isinstance(config, HFDatasetConfigDataModel):
                 eval_dataloaders[dataset_name] = HFDatasetLoader(**config.model_dump())
             elif isinstance(config, GenericDatasetConfigDataModel):
-                eval_dataloaders[dataset_name] = GenericDatasetConfigDataModel(**config.model_dump())
+                eval_dataloaders[dataset_name] = GenericDatasetLoader(**config.model_dump())
             else:
                 self.logger.warning(
                     f"The dataset config passed in for {dataset_name} is not a valid dataset config data model. Skipping..."
@@ -474,6 +475,7 @@ class TARGET:
             split (Literal["test", "train", "validation"], optional): split of data to run the tasks on.
             batch_size (int, optional): number of queries / number of tables to pass to the retriever at once.
             top_k (int, optional): top k tables to retrieve.
+            **kwargs: passed on to each task's `task_run`, e.g. `max_concurrent_datasets` to run a task's datasets concurrently.
         """
         self.logger.info("Started creating data loader objects...")
         self._update_dataloaders(split)
@@ -1,9 +1,20 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 
 
 class AbsGenerator(ABC):
-    def __init__(self):
-        pass
+    # number of `generate` calls `generate_batch` makes at once, for subclasses that don't call `__init__`
+    max_concurrency: int = 1
+
+    def __init__(self, max_concurrency: int = 1):
+        """
+        Parameters:
+            max_concurrency (int, optional): number of `generate` calls `generate_batch` makes at once. defaults to 1, the inputs are generated one after another. only opt into more if your `generate` is thread safe.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency needs to be at least 1, got {max_concurrency}.")
+        self.max_concurrency = max_concurrency
 
     @abstractmethod
     def generate(self, table_str: str, query: str) -> str:
@@ -18,3 +29,44 @@ class AbsGenerator(ABC):
             a string, the generated answer.
         """
         pass
+
+    def generate_batch(
+        self,
+        pairs: List[Tuple[str, str]],
+        max_concurrency: int = None,
+        return_exceptions: bool = False,
+    ) -> List:
+        """
+        Generate responses for a batch of inputs. Defaults to calling `generate` on each input, from a thread pool if the generator opted into a `max_concurrency` above 1. Override it if your generator can process a batch more efficiently.
+
+        Parameters:
+            pairs (List[Tuple[str, str]]): a list of (table_str, query) tuples, same as the inputs to `generate`.
+            max_concurrency (int, optional): caps the concurrent `generate` calls of this batch, 1 generates sequentially.
+                defaults to the generator's `max_concurrency`, which is never exceeded.
+                overrides should keep this name & default.
+            return_exceptions (bool, optional): if True, a failed input gets the exception it raised in place of its
+                answer & the other inputs are still generated. defaults to False, the first failure is raised.
+
+        Returns:
+            a list of generated answers, in the same order as the inputs.
+        """
+        generate = self._generate_or_exception if return_exceptions else self.generate
+        max_concurrency = self._get_concurrency(max_concurrency)
+        if max_concurrency <= 1 or len(pairs) <= 1:
+            return [generate(table_str, query) for table_str, query in pairs]
+        with ThreadPoolExecutor(max_workers=min(len(pairs), max_concurrency)) as executor:
+            return list(executor.map(lambda pair: generate(*pair), pairs))
+
+    def _generate_or_exception(self, table_str: str, query: str):
+        try:
+            return self.generate(table_str, query)
+        except Exception as e:
+            return e
+
+    def _get_concurrency(self, max_concurrency: int = None) -> int:
+        """
+        Concurrency of a `generate_batch` call, the requested cap but never more than the generator opted into.
+        """
+        if max_concurrency is None:
+            return self.max_concurrency
+        return min(max_concurrency, self.max_concurrency)
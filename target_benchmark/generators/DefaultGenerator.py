@@ -1,7 +1,9 @@
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -13,20 +15,36 @@ from target_benchmark.generators.GeneratorPrompts import (
 )
 
 
+@lru_cache(maxsize=8)
+def _get_language_model(model: str, temperature: float) -> ChatOpenAI:
+    # shared across generators so the client's http connection pool stays warm
+    return ChatOpenAI(model=model, temperature=temperature)
+
+
+@lru_cache(maxsize=8)
+def _build_chat_template(system_message: str, user_message: str) -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages(
+        [
+            SystemMessage(content=(system_message)),
+            HumanMessagePromptTemplate.from_template(user_message),
+        ]
+    )
+
+
 class DefaultGenerator(AbsGenerator):
     def __init__(
         self,
         system_message: str = DEFAULT_SYSTEM_PROMPT,
         user_message: str = QA_USER_PROMPT,
+        max_concurrency: int = None,
     ):
-        super().__init__()
-        self.language_model = ChatOpenAI(model=DEFAULT_LM, temperature=0.0)
-        self.chat_template = ChatPromptTemplate.from_messages(
-            [
-                SystemMessage(content=(system_message)),
-                HumanMessagePromptTemplate.from_template(user_message),
-            ]
-        )
+        # the chain's api requests are safe to send concurrently, so it opts into 16 at once. a subclass replacing
+        # `generate` is called for one input at a time, unless it passes a `max_concurrency` itself.
+        if max_concurrency is None:
+            max_concurrency = 16 if self._generates_with_chain() else 1
+        super().__init__(max_concurrency=max_concurrency)
+        self.language_model = _get_language_model(DEFAULT_LM, 0.0)
+        self.chat_template = _build_chat_template(system_message, user_message)
         self.chain = self.chat_template | self.language_model
 
     @retry(
@@ -39,3 +57,29 @@ class DefaultGenerator(AbsGenerator):
 
     def generate(self, table_str: str, query: str) -> Dict:
         return {"content": self._invoke_chain(table_str, query).content}
+
+    def _generates_with_chain(self) -> bool:
+        """
+        Whether `generate` is this class's own chain call. Batching through the chain would skip a subclass's `generate`.
+        """
+        return type(self).generate is DefaultGenerator.generate
+
+    def _batch_chain(self, pairs: List[Tuple[str, str]], max_concurrency: int, return_exceptions: bool = False):
+        # requests in the batch are sent concurrently, each retried on its own with the same backoff as `_invoke_chain`
+        invoke_chain = RunnableLambda(lambda inputs: self._invoke_chain(inputs["table_str"], inputs["query_str"]))
+        return invoke_chain.batch(
+            [{"table_str": table_str, "query_str": query} for table_str, query in pairs],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=return_exceptions,
+        )
+
+    def generate_batch(
+        self,
+        pairs: List[Tuple[str, str]],
+        max_concurrency: int = None,
+        return_exceptions: bool = False,
+    ) -> List[Dict]:
+        if not self._generates_with_chain():
+            return AbsGenerator.generate_batch(self, pairs, max_concurrency, return_exceptions)
+        outputs = self._batch_chain(pairs, self._get_concurrency(max_concurrency), return_exceptions)
+        return [output if isinstance(output, Exception) else {"content": output.content} for output in outputs]
@@ -1,9 +1,11 @@
 from typing import List, Tuple, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class DownstreamGeneratedResultDataModel(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     dataset_name: str
     query_id: Union[int, str]
     generated_results: Union[str, Tuple[str, str], List[str]]
@@ -1,9 +1,10 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from langchain.output_parsers import ResponseSchema, StructuredOutputParser
 from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 
+from target_benchmark.generators.AbsGenerator import AbsGenerator
 from target_benchmark.generators.DefaultGenerator import DefaultGenerator
 from target_benchmark.generators.GeneratorPrompts import (
     TEXT2SQL_SYSTEM_PROMPT,
@@ -16,8 +17,9 @@ class Text2SQLGenerator(DefaultGenerator):
         self,
         system_message: str = TEXT2SQL_SYSTEM_PROMPT,
         user_message: str = TEXT2SQL_USER_PROMPT,
+        max_concurrency: int = None,
     ):
-        super().__init__(system_message=system_message, user_message=user_message)
+        super().__init__(system_message=system_message, user_message=user_message, max_concurrency=max_concurrency)
 
         response_schemas = [
             ResponseSchema(
@@ -54,3 +56,16 @@ class Text2SQLGenerator(DefaultGenerator):
         # details can be found in the docs.
 
         return self._invoke_chain(table_str, query)
+
+    def _generates_with_chain(self) -> bool:
+        return type(self).generate is Text2SQLGenerator.generate
+
+    def generate_batch(
+        self,
+        pairs: List[Tuple[str, str]],
+        max_concurrency: int = None,
+        return_exceptions: bool = False,
+    ) -> List[Dict]:
+        if not self._generates_with_chain():
+            return AbsGenerator.generate_batch(self, pairs, max_concurrency, return_exceptions)
+        return self._batch_chain(pairs, self._get_concurrency(max_concurrency), return_exceptions)
@@ -1,4 +1,6 @@
+import os
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Iterable, List, Tuple
 
 from target_benchmark.dictionary_keys import QUERY_COL_NAME, QUERY_ID_COL_NAME
@@ -6,6 +8,22 @@ from target_benchmark.retrievers.AbsRetrieverBase import AbsRetrieverBase
 from target_benchmark.retrievers.RetrieversDataModels import RetrievalResultDataModel
 
 
+def _to_table_tuples(tables: List[Tuple], query_id: object) -> List[Tuple]:
+    """
+    Checks what `retrieve` returned for one query and turns each retrieved table into a (database id, table id) tuple.
+    Raises a TypeError for anything but a list of table identifiers, e.g. a bare table id string.
+    """
+    expected = "`retrieve` must return a list of (database id, table id) tuples"
+    if isinstance(tables, (str, bytes)):
+        raise TypeError(f"{expected}, got {tables!r} for query {query_id}")
+    table_tuples = []
+    for table in tables:
+        if not isinstance(table, (tuple, list)):
+            raise TypeError(f"{expected}, got an entry {table!r} for query {query_id}")
+        table_tuples.append(tuple(table))
+    return table_tuples
+
+
 class AbsCustomEmbeddingRetriever(AbsRetrieverBase):
     """
     This interface includes the retrieve method and an encode method that doesn't expect a return value. If your retrieval tool already has table embedding/encoding persistence built in, this is the preferred class to inherit from for your retriever. At retrieval time, it is assumed that the **table embeddings are no longer needed to be provided** for the retrieval to work.
@@ -14,12 +32,15 @@ class AbsCustomEmbeddingRetriever(AbsRetrieverBase):
     - your tool already deals with the persistence of the embedding.
     """
 
-    def __init__(self, expected_corpus_format: str = "nested array"):
+    def __init__(self, expected_corpus_format: str = "nested array", max_workers: int = 1):
         """
         Parameters:
             expected_corpus_format (str, optional): a string indicating what corpus format (ie nested array, dictionary, pandas df, etc.) the `embed_corpus` function expects from its input.
+
+            max_workers (int, optional): number of threads `retrieve_batch` uses to call `retrieve` on the queries of a batch concurrently. defaults to 1, the queries are retrieved one after another. only opt into more threads (None uses the number of cpus) if your `retrieve` is thread safe, ie it doesn't share a model or tokenizer that can't be called concurrently.
         """
         super().__init__(expected_corpus_format=expected_corpus_format)
+        self.max_workers = max_workers
 
     def retrieve_batch(
         self,
@@ -28,20 +49,24 @@ class AbsCustomEmbeddingRetriever(AbsRetrieverBase):
         top_k: int,
         **kwargs,
     ) -> List[RetrievalResultDataModel]:
-        retrieval_results = []
-        for query_id, query_str in zip(
-            queries[QUERY_ID_COL_NAME], queries[QUERY_COL_NAME]
-        ):
-            retrieval_results.append(
-                RetrievalResultDataModel(
-                    dataset_name=dataset_name,
-                    query_id=query_id,
-                    retrieval_results=self.retrieve(
-                        query_str, dataset_name, top_k, **kwargs
-                    ),
-                )
+        def retrieve_query(query_str: str) -> List[Tuple]:
+            return self.retrieve(query_str, dataset_name, top_k, **kwargs)
+
+        if self.max_workers == 1:
+            retrieved_tables = list(map(retrieve_query, queries[QUERY_COL_NAME]))
+        else:
+            # retrievals are independent & mostly spent outside the GIL (BLAS, network), so threads overlap them
+            with ThreadPoolExecutor(max_workers=self.max_workers or os.cpu_count()) as executor:
+                retrieved_tables = list(executor.map(retrieve_query, queries[QUERY_COL_NAME]))
+        # skip pydantic validation, the user results are only checked & coerced to tuples (they're used in set lookups)
+        return [
+            RetrievalResultDataModel.model_construct(
+                dataset_name=dataset_name,
+                query_id=query_id,
+                retrieval_results=_to_table_tuples(tables, query_id),
             )
-        return retrieval_results
+            for query_id, tables in zip(queries[QUERY_ID_COL_NAME], retrieved_tables)
+        ]
 
     @abstractmethod
     def retrieve(
@@ -58,7 +58,7 @@ class AbsStandardEmbeddingRetriever(AbsRetrieverBase):
                 with_payload=True,
             )
             retrieval_results.append(
-                RetrievalResultDataModel(
+                RetrievalResultDataModel.model_construct(
                     dataset_name=dataset_name,
                     query_id=query_id,
                     retrieval_results=[
@@ -1,9 +1,20 @@
-from typing import List, Tuple, Union
+from functools import cached_property
+from typing import FrozenSet, List, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class RetrievalResultDataModel(BaseModel):
+    # results are never reassigned after retrieval, which also keeps `retrieval_set` valid
+    model_config = ConfigDict(frozen=True)
+
     dataset_name: str
     query_id: Union[int, str]
     retrieval_results: List[Tuple] = Field(default=[], description="retrieved table, a tuple of (database id, table id)")
+
+    @cached_property
+    def retrieval_set(self) -> FrozenSet[Tuple]:
+        """
+        The retrieved tables as a set, for constant time membership checks. Computed once per result.
+        """
+        return frozenset(self.retrieval_results)
@@ -6,29 +6,56 @@
 # LICENSE file in the root directory of this source tree.
 """Interactive mode for the tfidf DrQA retriever module."""
 import ast
-import json
 import os
 from pathlib import Path
-from typing import Dict, Iterable, List, Literal, Union
+from typing import Dict, Iterable, Iterator, List, Literal, Tuple, Union
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import scipy.sparse as sp
+from datasets import Dataset
 from dotenv import load_dotenv
 
+from target_benchmark.dictionary_keys import (
+    CONTEXT_COL_NAME,
+    DATABASE_ID_COL_NAME,
+    QUERY_COL_NAME,
+    QUERY_ID_COL_NAME,
+    TABLE_COL_NAME,
+    TABLE_ID_COL_NAME,
+)
 from target_benchmark.retrievers.AbsCustomEmbeddingRetriever import (
     AbsCustomEmbeddingRetriever,
 )
+from target_benchmark.retrievers.RetrieversDataModels import RetrievalResultDataModel
 from target_benchmark.retrievers.ottqa.drqa import retriever
 from target_benchmark.retrievers.ottqa.utils import (
     TFIDFBuilder,
-    convert_table_representation,
+    convert_table_representations,
     default_hash_size,
     default_tokenizer,
     get_filename,
+    hash_corpus_columns,
+    load_converted_corpus,
+    save_converted_corpus,
 )
 
 file_dir = os.path.dirname(os.path.realpath(__file__))
 default_out_dir = os.path.join(file_dir, "retrieval_files")
 
 
+def top_k_order(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Positions of the `top_k` highest scores, best first. Mirrors the ranking of `closest_docs`:
+    only the top k scores are partitioned out in linear time and sorted, never the whole row.
+    """
+    if len(scores) <= top_k:
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, top_k)[:top_k]
+    return top[np.argsort(-scores[top])]
+
+
 class OTTQARetriever(AbsCustomEmbeddingRetriever):
     def __init__(
         self,
@@ -46,6 +73,8 @@ class OTTQARetriever(AbsCustomEmbeddingRetriever):
 
         self.out_dir = out_dir
         self.rankers: Dict[str, Union[retriever.TfidfDocRanker, retriever.BM25DocRanker]] = {}
+        # (database id, table id) of each document, indexed by the ranker's doc index
+        self.doc_tuples: Dict[str, List[Tuple]] = {}
         self.withtitle = withtitle
         self.encoding = encoding
         self.ngram = ngram
@@ -57,6 +86,31 @@ class OTTQARetriever(AbsCustomEmbeddingRetriever):
             "bm25",
         ], "encoding unknown, should be tfidf or bm25"
 
+    def retrieve_batch(
+        self,
+        queries: Dict[str, List],
+        dataset_name: str,
+        top_k: int,
+        **kwargs,
+    ) -> List[RetrievalResultDataModel]:
+        ranker = self.rankers[dataset_name]
+        doc_tuples = self.doc_tuples[dataset_name]
+        # score the whole batch with a single sparse matmul instead of one dot product per query
+        query_mat = sp.vstack([ranker.text2spvec(query) for query in queries[QUERY_COL_NAME]], format="csr")
+        scores = query_mat @ ranker.doc_mat
+        retrieval_results = []
+        for query_id, start, end in zip(queries[QUERY_ID_COL_NAME], scores.indptr[:-1], scores.indptr[1:]):
+            row_doc_indices = scores.indices[start:end][top_k_order(scores.data[start:end], top_k)]
+            # the doc tuples are built by the retriever itself, no need for pydantic validation
+            retrieval_results.append(
+                RetrievalResultDataModel.model_construct(
+                    dataset_name=dataset_name,
+                    query_id=query_id,
+                    retrieval_results=[doc_tuples[i] for i in row_doc_indices],
+                )
+            )
+        return retrieval_results
+
     def retrieve(
         self,
         query: str,
@@ -65,13 +119,25 @@ class OTTQARetriever(AbsCustomEmbeddingRetriever):
         **kwargs,
     ) -> List[str]:
         ranker = self.rankers[dataset_name]
-        doc_names, doc_scores = ranker.closest_docs(query, top_k)
-        return [ast.literal_eval(doc_name) for doc_name in doc_names]
+        scores = ranker.text2spvec(query) @ ranker.doc_mat
+        # index straight into the parsed doc tuples instead of round tripping through the doc names
+        doc_tuples = self.doc_tuples[dataset_name]
+        return [doc_tuples[i] for i in scores.indices[top_k_order(scores.data, top_k)]]
 
-    def embed_corpus(self, dataset_name: str, corpus: Iterable[Dict]):
+    def embed_corpus(self, dataset_name: str, corpus: Union[Iterable[Dict], Dataset, pa.Table]):
         path_to_out_dir = Path(self.out_dir)
         path_to_out_dir.mkdir(parents=True, exist_ok=True)
 
+        # the persisted files are keyed on the incoming corpus, a changed corpus never reuses stale ones.
+        # a huggingface dataset carries its own fingerprint, so a warm start doesn't touch the corpus at all.
+        column_batches = None
+        if isinstance(corpus, Dataset):
+            corpus_hash = corpus._fingerprint
+        else:
+            # any other corpus is hashed in one pass, keeping only the columns that get indexed (no table bodies).
+            # the corpus may be a generator, so the same batches are reused for converting on a cold start.
+            column_batches = list(self._iter_corpus_columns(corpus))
+            corpus_hash = hash_corpus_columns(column_batches)
         out_path = get_filename(
             self.out_dir,
             self.encoding,
@@ -80,33 +146,15 @@ class OTTQARetriever(AbsCustomEmbeddingRetriever):
             self.hash_size,
             self.tokenizer,
             dataset_name,
+            corpus_hash,
         )
-        file_name = f"{dataset_name}_{self.encoding}_{self.withtitle}.json"
-        path_to_persist_file = Path(self.out_dir) / file_name
-        # either load or create converted corpus
-        if Path(out_path).exists():
-            print(f"file_name: {path_to_persist_file}")
-            out_path = get_filename(
-                self.out_dir,
-                self.encoding,
-                self.withtitle,
-                self.ngram,
-                self.hash_size,
-                self.tokenizer,
-                dataset_name,
-            )
-        else:
-            converted_corpus = {}
-            if path_to_persist_file.exists():
-                with open(path_to_persist_file, "r") as file:
-                    converted_corpus = json.load(file)
-            if not path_to_persist_file.exists():
-                converted_corpus = self.create_converted_corpus(corpus)
-                with open(path_to_persist_file, "w") as file:
-                    # Write the dictionary to a file in JSON format
-                    json.dump(converted_corpus, file)
-            builder = TFIDFBuilder()
-            out_path = builder.build_tfidf(
+        # building the tf-idf matrix dominates the embedding time, only do it on cold starts
+        if not Path(out_path).exists():
+            file_name = f"{dataset_name}_{self.encoding}_{self.withtitle}_corpus={corpus_hash}.parquet"
+            if column_batches is None:
+                column_batches = self._iter_corpus_columns(corpus)
+            converted_corpus = self._read_or_build_converted_corpus(column_batches, path_to_out_dir / file_name)
+            out_path = TFIDFBuilder().build_tfidf(
                 self.out_dir,
                 converted_corpus,
                 dataset_name=dataset_name,
@@ -115,30 +163,75 @@ class OTTQARetriever(AbsCustomEmbeddingRetriever):
                 hash_size=self.hash_size,
                 tokenizer=self.tokenizer,
                 with_title=self.withtitle,
+                corpus_hash=corpus_hash,
             )
-        self.rankers[dataset_name] = retriever.get_class(self.encoding)(tfidf_path=out_path)
+        ranker = retriever.get_class(self.encoding)(tfidf_path=out_path)
+        self.rankers[dataset_name] = ranker
+        # parse the stringified doc ids once here rather than on every retrieval
+        self.doc_tuples[dataset_name] = [ast.literal_eval(doc_id) for doc_id in ranker.doc_dict[1]]
+
+    def _read_or_build_converted_corpus(
+        self,
+        column_batches: Iterable[Tuple[List, List, List, List]],
+        path_to_persist_file: Path,
+    ) -> Dict:
+        if path_to_persist_file.exists():
+            return load_converted_corpus(path_to_persist_file)
+        converted_corpus = self._convert_column_batches(column_batches)
+        save_converted_corpus(path_to_persist_file, converted_corpus)
+        return converted_corpus
 
     def create_converted_corpus(
         self,
-        corpus: Iterable[Dict],
+        corpus: Union[Iterable[Dict], Dataset, pa.Table],
     ) -> Dict:
+        return self._convert_column_batches(self._iter_corpus_columns(corpus))
+
+    def _convert_column_batches(self, column_batches: Iterable[Tuple[List, List, List, List]]) -> Dict:
         converted_corpus = {}
-        for entry in corpus:
-            for db_id, table_id, table, context in zip(
-                entry["database_id"],
-                entry["table_id"],
-                entry["table"],
-                entry["context"],
-            ):
-                # Setting to evaluate influence of table name in embedding
-
-                tup = (db_id, table_id)
-
-                converted_corpus[str(tup)] = convert_table_representation(
-                    db_id,
-                    table_id,
-                    table,
-                    context["section_title"] if context and "section_title" in context else "",
+        for database_ids, table_ids, headers, contexts in column_batches:
+            section_titles = [
+                context["section_title"] if context and "section_title" in context else ""
+                for context in contexts
+            ]
+            converted_corpus.update(
+                convert_table_representations(
+                    database_ids,
+                    table_ids,
+                    headers,
+                    section_titles,
                     self.withtitle,
                 )
+            )
         return converted_corpus
+
+    @staticmethod
+    def _iter_corpus_columns(
+        corpus: Union[Iterable[Dict], Dataset, pa.Table],
+        batch_size: int = 4096,
+    ) -> Iterator[Tuple[List, List, List, List]]:
+        """
+        Yield (database ids, table ids, headers, contexts) column batches of the corpus.
+        Arrow backed corpora are read in record batches and only the header row of each table is
+        turned into python objects, the table bodies stay in arrow memory.
+        """
+        if isinstance(corpus, Dataset):
+            batches = corpus.with_format("arrow").iter(batch_size=batch_size)
+        elif isinstance(corpus, pa.Table):
+            batches = corpus.to_batches(max_chunksize=batch_size)
+        else:
+            for entry in corpus:
+                yield (
+                    entry[DATABASE_ID_COL_NAME],
+                    entry[TABLE_ID_COL_NAME],
+                    [table[0] for table in entry[TABLE_COL_NAME]],
+                    entry[CONTEXT_COL_NAME],
+                )
+            return
+        for batch in batches:
+            yield (
+                batch.column(DATABASE_ID_COL_NAME).to_pylist(),
+                batch.column(TABLE_ID_COL_NAME).to_pylist(),
+                pc.list_element(batch.column(TABLE_COL_NAME), 0).to_pylist(),
+                batch.column(CONTEXT_COL_NAME).to_pylist(),
+            )
@@ -1,4 +1,5 @@
 import gzip
+import hashlib
 import importlib.util
 import json
 import math
@@ -11,9 +12,11 @@ from collections import Counter
 from functools import partial
 from multiprocessing import Pool as ProcessPool
 from multiprocessing.util import Finalize
-from typing import Dict, List, Union
+from typing import Dict, Iterable, List, Tuple, Union
 
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import scipy.sparse as sp
 from dateutil.parser import parse
 from nltk.tokenize import sent_tokenize, word_tokenize
@@ -177,25 +180,55 @@ def build_corpus(tables: dict, tmp_file: str):
     fw.close()
 
 
-def convert_table_representation(
-    database_id,
-    table_id: str,
-    table_contents: List[List],
-    section_title: str,
+def convert_table_representations(
+    database_ids: List,
+    table_ids: List[str],
+    headers: List[List[str]],
+    section_titles: List[str],
     with_title: bool,
-) -> Dict[str, object]:
-    table_headers = table_contents[0]
-    table_data = table_contents[1:]
+) -> Dict[str, Dict[str, object]]:
+    """Convert a batch of tables column by column, keyed by table uid.
+
+    Only the fields read by `build_corpus` are kept, the table bodies are never indexed.
+    """
+    uids = [str((database_id, table_id)) for database_id, table_id in zip(database_ids, table_ids)]
     # remove title due to high correspondence but keep uid
+    titles = table_ids if with_title else [""] * len(uids)
     return {
-        "uid": str((database_id, table_id)),
-        "title": table_id if with_title else "",
-        "header": table_headers,
-        "data": table_data,
-        "section_title": section_title,
+        uid: {
+            "uid": uid,
+            "title": title,
+            "header": header,
+            "section_title": section_title,
+        }
+        for uid, title, header, section_title in zip(uids, titles, headers, section_titles)
     }
 
 
+def save_converted_corpus(path: str, converted_corpus: Dict[str, Dict]) -> None:
+    """Persist the converted corpus as a zstd compressed parquet file, one row per table."""
+    table = pa.Table.from_pylist(list(converted_corpus.values()))
+    pq.write_table(table, path, compression="zstd")
+
+
+def load_converted_corpus(path: str) -> Dict[str, Dict]:
+    """Memory map a converted corpus persisted by `save_converted_corpus`, keyed by table uid."""
+    table = pq.read_table(path, memory_map=True)
+    return {row["uid"]: row for row in table.to_pylist()}
+
+
+def hash_corpus_columns(column_batches: Iterable[Tuple[List, List, List, List]]) -> str:
+    """Short content hash of the indexed columns (database ids, table ids, headers, contexts) of a corpus.
+
+    Hashed row by row, so the hash doesn't depend on how the corpus is batched & the corpus is never serialized as a whole.
+    """
+    hasher = hashlib.sha256()
+    for batch in column_batches:
+        for row in zip(*batch):
+            hasher.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+    return hasher.hexdigest()[:16]
+
+
 def get_filename(
     out_dir: str,
     option: str,
@@ -204,9 +237,10 @@ def get_filename(
     hash_size: int,
     tokenizer: str,
     dataset_name: str,
+    corpus_hash: str = None,
 ) -> str:
     basename = "index"
-    basename += "-%s-%s-ngram=%d-hash=%d-tokenizer=%s-dataset=%s.npz" % (
+    basename += "-%s-%s-ngram=%d-hash=%d-tokenizer=%s-dataset=%s" % (
         option,
         str(with_title),
         ngram,
@@ -214,7 +248,9 @@ def get_filename(
         tokenizer,
         dataset_name,
     )
-    return os.path.join(out_dir, basename)
+    if corpus_hash:
+        basename += "-corpus=%s" % corpus_hash
+    return os.path.join(out_dir, basename + ".npz")
 
 
 default_hash_size = int(math.pow(2, 24))
@@ -243,6 +279,7 @@ class TFIDFBuilder:
         hash_size: int = default_hash_size,
         tokenizer: str = default_tokenizer,
         with_title: bool = True,
+        corpus_hash: str = None,
     ):
         if not os.path.exists(out_dir):
             os.mkdir(out_dir)
@@ -259,7 +296,7 @@ class TFIDFBuilder:
 
         freqs = self.get_doc_freqs(count_matrix)
 
-        filename = get_filename(out_dir, option, with_title, ngram, hash_size, tokenizer, dataset_name)
+        filename = get_filename(out_dir, option, with_title, ngram, hash_size, tokenizer, dataset_name, corpus_hash)
 
         metadata = {
             "doc_freqs": freqs,
@@ -1,8 +1,10 @@
+import copy
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
-from typing import Dict, Generator, List, Tuple, Union
+from typing import Callable, Dict, Generator, List, Tuple, Type, Union
 
 from tqdm import tqdm
 
@@ -23,6 +25,7 @@ from target_benchmark.dictionary_keys import (
     DATABASE_ID_COL_NAME,
     DATASET_NAME,
     HF_DATASET_CONFIG_CORPUS_FIELD,
+    QUERY_ID_COL_NAME,
     QUERY_TYPE,
     TABLE_ID_COL_NAME,
 )
@@ -50,12 +53,20 @@ from target_benchmark.tasks.utils import (
     find_resume_indices,
     generate_batches_from_file,
     load_data_model_from_persistence_file,
+    prefetch,
     update_query_batch,
     validate_dataset_configs,
 )
 
+# (query batch, dataset name, top k) -> retrieval results
+RetrieveBatchFn = Callable[[Dict[str, List], str, int], List[RetrievalResultDataModel]]
+
 
 class AbsTask(ABC):
+    # whether the downstream generation reads the retrieved tables' contents from the `table_id_to_table` mapping.
+    # tasks that don't should set this to False, so the mapping (and its markdown strings) is never built.
+    NEEDS_TABLE_STRS: bool = True
+
     def __init__(
         self,
         task_name: str = None,
@@ -90,10 +101,9 @@ class AbsTask(ABC):
         self.task_generator = task_generator
         if task_generator is None and task_name != "Table Retrieval Task":
             self.task_generator = DefaultGenerator()
-        self.total_queries_processed = 0
-        self.num_overlap = 0
-        self.total_tables = 0
-        self.total_tables_capped = 0
+        self._reset_retrieval_metrics()
+        # markdown strings of the tables retrieved so far from the current dataset, by (database id, table id)
+        self._table_str_cache: Dict[Tuple[str, str], str] = {}
 
     @classmethod
     @abstractmethod
@@ -144,32 +154,49 @@ class AbsTask(ABC):
         """
         if datasets_config is None:
             return self._get_default_dataset_config()
-        constructed_config = {}
-        for key, value in datasets_config.items():
-            assert key not in constructed_config, f"duplicate dataset name {key}!"
-            if isinstance(value, Dict):
-                # TODO: Needle in haystack config creation
-                assert QUERY_TYPE in value, f"need to specify a query type in the dictionary config with key {QUERY_TYPE}"
-                if key not in value:
-                    value[DATASET_NAME] = key
-                if value[QUERY_TYPE] == QueryType.TEXT_2_SQL.value:
-                    constructed_config[key] = Text2SQLDatasetConfigDataModel(**value)
-                elif value[QUERY_TYPE] == QueryType.NIH.value:
-                    constructed_config[key] = NeedleInHaystackDatasetConfigDataModel(**value)
-                elif HF_DATASET_CONFIG_CORPUS_FIELD in value:
-                    constructed_config[key] = HFDatasetConfigDataModel(**value)
-                else:
-                    constructed_config[key] = GenericDatasetConfigDataModel(**value)
-            elif isinstance(value, DatasetConfigDataModel):
-                constructed_config[key] = value
-            else:
-                wrong_type = type(value)
-                raise ValueError(
-                    f"passed in config {value} is of type {wrong_type}, not one of type dictionary or `DatasetConfigDataModel`."
-                )
+        # validate all configs up front, before any data model is built
+        wrong_types = {
+            key: type(value)
+            for key, value in datasets_config.items()
+            if not isinstance(value, (Dict, DatasetConfigDataModel))
+        }
+        if wrong_types:
+            raise ValueError(
+                f"passed in configs {list(wrong_types)} are of types {list(wrong_types.values())}, "
+                "not one of type dictionary or `DatasetConfigDataModel`."
+            )
+        missing_query_type = [
+            key for key, value in datasets_config.items() if isinstance(value, Dict) and QUERY_TYPE not in value
+        ]
+        if missing_query_type:
+            raise AssertionError(
+                f"need to specify a query type in the dictionary configs {missing_query_type} with key {QUERY_TYPE}"
+            )
+        # TODO: Needle in haystack config creation
+        constructed_config = {
+            key: (
+                value
+                if isinstance(value, DatasetConfigDataModel)
+                else self._get_config_data_model_class(value)(**{**value, DATASET_NAME: key})
+            )
+            for key, value in datasets_config.items()
+        }
         validate_dataset_configs(constructed_config)
         return constructed_config
 
+    @staticmethod
+    def _get_config_data_model_class(config: Dict[str, str]) -> Type[DatasetConfigDataModel]:
+        """
+        Returns the dataset config data model class matching a dictionary config.
+        """
+        if config[QUERY_TYPE] == QueryType.TEXT_2_SQL.value:
+            return Text2SQLDatasetConfigDataModel
+        if config[QUERY_TYPE] == QueryType.NIH.value:
+            return NeedleInHaystackDatasetConfigDataModel
+        if HF_DATASET_CONFIG_CORPUS_FIELD in config:
+            return HFDatasetConfigDataModel
+        return GenericDatasetConfigDataModel
+
     def get_dataset_config(self) -> Dict[str, DatasetConfigDataModel]:
         """
         Returns the dataset config of the task.
@@ -201,13 +228,12 @@ class AbsTask(ABC):
 
     def _run_retrieval_batch(
         self,
-        retriever: AbsRetrieverBase,
+        retrieve_batch: RetrieveBatchFn,
         dataset_name: str,
         query_batch: Dict[str, List],
         top_k: int,
         prev_retrieval_results_gen: Generator[List[RetrievalResultDataModel], None, None],
         path_to_retrieval_results: Union[Path, None],
-        **kwargs,
     ) -> tuple[list[RetrievalResultDataModel], float, float, int]:
         """
         Run the retrieval on a new batch of queries.
@@ -233,11 +259,10 @@ class AbsTask(ABC):
             updated_batch = update_query_batch(query_batch, num_prev_res)
             # call retriever to get new results
             retrieval_results_new, process_duration, wall_clock_duration = self._get_retrieval_results(
-                retriever,
+                retrieve_batch,
                 updated_batch,
                 dataset_name,
                 top_k,
-                **kwargs,
             )
 
             # write results
@@ -289,6 +314,7 @@ class AbsTask(ABC):
         top_k: int = 5,
         path_to_retrieval_results_dir: Union[Path, None] = None,
         path_to_downstream_results_dir: Union[Path, None] = None,
+        max_concurrent_datasets: int = 1,
         **kwargs,
     ) -> Dict[str, TaskResultsDataModel]:
         """
@@ -300,98 +326,203 @@ class AbsTask(ABC):
             logger (Logger): Logger instance to log the task execution details.
             batch_size (int): The number of items to process in a single batch. Default is 64.
             top_k (int, optional): The top k tables to retrieve. Default is 5.
+            max_concurrent_datasets (int, optional): number of datasets whose batches run at the same time. Default is 1, the datasets run one after another. the concurrent datasets share the retriever & the generator, only opt in if both are thread safe. tasks keeping their own metric state need to reset it in `_reset_downstream_task_metrics`.
             **kwargs: Additional keyword arguments for fine-tuning the task execution.
 
         Returns:
             A dictionary with the results of the retrieval task. Maps dataset name to a task result data model object. The task result data model object records both the retrieval performance and the downstream generation results.
         """
         self._validate_dataset_loaders(dataset_loaders)
+        if max_concurrent_datasets < 1:
+            raise ValueError(f"max_concurrent_datasets needs to be at least 1, got {max_concurrent_datasets}.")
 
         assert isinstance(retriever, CustomEmbRetr) or isinstance(
             retriever, StandardizedEmbRetr
         ), "the passed in retriever doesn't correctly inherit from the standardized or custom retriever classes!"
 
-        task_results = {}
-
         logger.info(f"start task {self.task_name}")
 
-        for dataset_name, dataset_loader in dataset_loaders.items():
-            # construct the path to persistence files
-            path_to_retrieval_results = construct_persistence_path(path_to_retrieval_results_dir, dataset_name, top_k)
-            path_to_downstream_results = construct_persistence_path(path_to_downstream_results_dir, dataset_name, top_k)
-
-            # construct generators
-            prev_retrieval_res_gen = generate_batches_from_file(
-                path_to_retrieval_results,
-                batch_size,
-                RetrievalResultDataModel,
-            )
-            prev_downstream_res_gen = generate_batches_from_file(
-                path_to_downstream_results,
-                batch_size,
-                DownstreamGeneratedResultDataModel,
-            )
-
-            logger.info(f"running task on dataset {dataset_name}")
-
-            table_id_to_table = dataset_loader.get_table_id_to_table()
-            # some retrieval metrics to track
-            total_process_duration = 0
-            total_wall_clock_duration = 0
-            total_num_retrieved = 0
-
-            # set up progress bar
-            total_num_queries = dataset_loader.get_queries_size()
-            progress_bar = tqdm(total=total_num_queries, desc=f"Retrieving Tables for {dataset_name}...")
-            for query_batch in dataset_loader.get_queries_for_task(batch_size=batch_size):
-                # run retrieval on batch
-                retrieval_results, process_duration, wall_clock_duration, num_retrieved = self._run_retrieval_batch(
-                    retriever=retriever,
-                    dataset_name=dataset_name,
-                    query_batch=query_batch,
-                    top_k=top_k,
-                    prev_retrieval_results_gen=prev_retrieval_res_gen,
-                    path_to_retrieval_results=path_to_retrieval_results,
+        run_kwargs = dict(
+            # resolve how to call the retriever once, instead of on every batch
+            retrieve_batch=self._bind_retrieve_batch(retriever, **kwargs),
+            logger=logger,
+            batch_size=batch_size,
+            top_k=top_k,
+            path_to_retrieval_results_dir=path_to_retrieval_results_dir,
+            path_to_downstream_results_dir=path_to_downstream_results_dir,
+            **kwargs,
+        )
+        if max_concurrent_datasets == 1 or len(dataset_loaders) <= 1:
+            return {
+                dataset_name: self._calculate_dataset_performance(
+                    dataset_name,
+                    logger,
+                    top_k,
+                    *self._run_dataset_batches(dataset_name=dataset_name, dataset_loader=dataset_loader, **run_kwargs),
                     **kwargs,
                 )
-
-                # update time spent
-                total_process_duration += process_duration
-                total_wall_clock_duration += wall_clock_duration
-                total_num_retrieved += num_retrieved
-
-                # run downstream on batch
-                self._run_downstream_batch(
-                    retrieval_results,
-                    dataset_name,
-                    query_batch,
-                    table_id_to_table,
-                    prev_downstream_res_gen,
-                    path_to_downstream_results,
+                for dataset_name, dataset_loader in dataset_loaders.items()
+            }
+        # opted in: datasets mostly wait on retrieval / generation requests, so their batches run concurrently.
+        # each dataset runs on its own copy of the task, the metric state isn't shared between datasets.
+        task_copies = {dataset_name: self._copy_with_new_metrics() for dataset_name in dataset_loaders}
+        with ThreadPoolExecutor(max_workers=min(max_concurrent_datasets, len(dataset_loaders))) as executor:
+            futures = {
+                dataset_name: executor.submit(
+                    task_copies[dataset_name]._run_dataset_batches,
+                    dataset_name=dataset_name,
+                    dataset_loader=dataset_loader,
+                    **run_kwargs,
                 )
+                for dataset_name, dataset_loader in dataset_loaders.items()
+            }
+            retrieval_durations = {dataset_name: future.result() for dataset_name, future in futures.items()}
+        # the performances are calculated one dataset at a time, once all threads are done. the metric objects
+        # (e.g. `evaluate` modules) are shared by the copies & not thread safe, and some tasks fork processes here.
+        results = {
+            dataset_name: task_copy._calculate_dataset_performance(
+                dataset_name,
+                logger,
+                top_k,
+                *retrieval_durations[dataset_name],
+                **kwargs,
+            )
+            for dataset_name, task_copy in task_copies.items()
+        }
+        # leave the retrieval metrics of the last dataset on the task, same as running the datasets one by one does
+        last_copy = task_copies[next(reversed(task_copies))]
+        self.total_queries_processed = last_copy.total_queries_processed
+        self.num_overlap = last_copy.num_overlap
+        self.total_tables = last_copy.total_tables
+        self.total_tables_capped = last_copy.total_tables_capped
+        return results
+
+    def _run_dataset_batches(
+        self,
+        retrieve_batch: RetrieveBatchFn,
+        dataset_name: str,
+        dataset_loader: AbsDatasetLoader,
+        logger: Logger,
+        batch_size: int,
+        top_k: int,
+        path_to_retrieval_results_dir: Union[Path, None] = None,
+        path_to_downstream_results_dir: Union[Path, None] = None,
+        **kwargs,
+    ) -> Tuple[float, float, int]:
+        """
+        Runs the retrieval & downstream task on all query batches of a single dataset.
+        Resets & updates the metric state of the task object it is called on, `_calculate_dataset_performance`
+        calculates the dataset's performance from it afterwards.
 
-                if self.total_queries_processed % 200 == 0:
-                    logger.info(f"number of queries processed: {self.total_queries_processed}")
-                progress_bar.update(batch_size)
-            progress_bar.update(total_num_queries - progress_bar.n)
-            progress_bar.close()
+        Returns:
+            the total process & wall clock durations of the retrieval, and the number of queries retrieved for.
+        """
+        # construct the path to persistence files
+        path_to_retrieval_results = construct_persistence_path(path_to_retrieval_results_dir, dataset_name, top_k)
+        path_to_downstream_results = construct_persistence_path(path_to_downstream_results_dir, dataset_name, top_k)
+
+        # construct generators
+        prev_retrieval_res_gen = generate_batches_from_file(
+            path_to_retrieval_results,
+            batch_size,
+            RetrievalResultDataModel,
+        )
+        prev_downstream_res_gen = generate_batches_from_file(
+            path_to_downstream_results,
+            batch_size,
+            DownstreamGeneratedResultDataModel,
+        )
 
-            # retrieval performance, precision, recall, f1, etc.
-            retrieval_performance = self._calculate_table_retrieval_performance(
+        logger.info(f"running task on dataset {dataset_name}")
+        self._reset_retrieval_metrics()
+
+        table_id_to_table = dataset_loader.get_table_id_to_table() if self.NEEDS_TABLE_STRS else {}
+        self._table_str_cache = {}
+        # some retrieval metrics to track
+        total_process_duration = 0
+        total_wall_clock_duration = 0
+        total_num_retrieved = 0
+
+        # set up progress bar
+        total_num_queries = dataset_loader.get_queries_size()
+        progress_bar = tqdm(total=total_num_queries, desc=f"Retrieving Tables for {dataset_name}...")
+        # load the next query batches while the current one is retrieved & generated for
+        for query_batch in prefetch(dataset_loader.get_queries_for_task(batch_size=batch_size), num_prefetched=2):
+            if not query_batch[QUERY_ID_COL_NAME]:
+                # nothing to retrieve or generate for, e.g. an empty trailing batch
+                continue
+            # run retrieval on batch
+            retrieval_results, process_duration, wall_clock_duration, num_retrieved = self._run_retrieval_batch(
+                retrieve_batch,
+                dataset_name,
+                query_batch,
                 top_k,
-                total_process_duration,
-                total_wall_clock_duration,
-                total_num_retrieved,
+                prev_retrieval_res_gen,
+                path_to_retrieval_results,
             )
-            # downstream performance, depends on what task is being run.
-            downstream_task_performance = self._calculate_downstream_task_performance(**kwargs)
 
-            task_results[dataset_name] = TaskResultsDataModel(
-                retrieval_performance=retrieval_performance,
-                downstream_task_performance=downstream_task_performance,
+            # update time spent
+            total_process_duration += process_duration
+            total_wall_clock_duration += wall_clock_duration
+            total_num_retrieved += num_retrieved
+
+            # run downstream on batch
+            self._run_downstream_batch(
+                retrieval_results,
+                dataset_name,
+                query_batch,
+                table_id_to_table,
+                prev_downstream_res_gen,
+                path_to_downstream_results,
             )
-            logger.info(f"finished running task {self.task_name}")
-        return task_results
+
+            if self.total_queries_processed % 200 == 0:
+                logger.info("number of queries processed: %d", self.total_queries_processed)
+            progress_bar.update(batch_size)
+        progress_bar.update(total_num_queries - progress_bar.n)
+        progress_bar.close()
+        return total_process_duration, total_wall_clock_duration, total_num_retrieved
+
+    def _calculate_dataset_performance(
+        self,
+        dataset_name: str,
+        logger: Logger,
+        top_k: int,
+        total_process_duration: float,
+        total_wall_clock_duration: float,
+        total_num_retrieved: int,
+        **kwargs,
+    ) -> TaskResultsDataModel:
+        """
+        Calculates the retrieval & downstream performance on a dataset, after `_run_dataset_batches` ran on it.
+        """
+        # retrieval performance, precision, recall, f1, etc.
+        retrieval_performance = self._calculate_table_retrieval_performance(
+            top_k,
+            total_process_duration,
+            total_wall_clock_duration,
+            total_num_retrieved,
+        )
+        # downstream performance, depends on what task is being run.
+        downstream_task_performance = self._calculate_downstream_task_performance(**kwargs)
+
+        logger.info(f"finished running task {self.task_name} on dataset {dataset_name}")
+        return TaskResultsDataModel(
+            retrieval_performance=retrieval_performance,
+            downstream_task_performance=downstream_task_performance,
+        )
+
+    def _copy_with_new_metrics(self) -> "AbsTask":
+        """
+        Returns a shallow copy of the task with freshly initialized metric state.
+        The generator, configs & metric objects are shared with the original task, so only the batches of copies
+        may run concurrently, their performances are calculated one at a time.
+        """
+        task_copy = copy.copy(self)
+        task_copy._reset_retrieval_metrics()
+        task_copy._table_str_cache = {}
+        task_copy._reset_downstream_task_metrics()
+        return task_copy
 
     def evaluate_downstream(
         self,
@@ -426,7 +557,8 @@ class AbsTask(ABC):
         batch_size = 1
         idx = 0
         for dataset_name, dataset_loader in dataset_loaders.items():
-            table_id_to_table = dataset_loader.get_table_id_to_table()
+            table_id_to_table = dataset_loader.get_table_id_to_table() if self.NEEDS_TABLE_STRS else {}
+            self._table_str_cache = {}
             resume_index = resume_indices[dataset_name]
             for current_index, query_batch in tqdm(
                 enumerate(dataset_loader.get_queries_for_task(batch_size)),
@@ -455,19 +587,44 @@ class AbsTask(ABC):
 
         return task_results
 
+    @staticmethod
+    def _bind_retrieve_batch(retriever: AbsRetrieverBase, **kwargs) -> RetrieveBatchFn:
+        """
+        Returns a function calling the `retrieve_batch` method of the retriever with the arguments its retriever type needs.
+
+        Parameters:
+            retriever (AbsRetrieverBase): The retriever for fetching the results.
+            **kwargs: task run keyword arguments, must contain the vector db client for standardized retrievers.
+        """
+        if isinstance(retriever, StandardizedEmbRetr):
+            if CLIENT_KEY_NAME not in kwargs:
+                raise KeyError(f"missing kwarg {CLIENT_KEY_NAME}, required for standardized retriever")
+            client = kwargs[CLIENT_KEY_NAME]
+
+            def retrieve_batch(query_batch: Dict[str, List], dataset_name: str, top_k: int):
+                return retriever.retrieve_batch(queries=query_batch, dataset_name=dataset_name, top_k=top_k, client=client)
+
+            return retrieve_batch
+        if isinstance(retriever, CustomEmbRetr):
+
+            def retrieve_batch(query_batch: Dict[str, List], dataset_name: str, top_k: int):
+                return retriever.retrieve_batch(queries=query_batch, dataset_name=dataset_name, top_k=top_k)
+
+            return retrieve_batch
+        raise ValueError(f"retriever passed in doesn't inherit from the base retriever classes! (is of type {type(retriever)})")
+
     def _get_retrieval_results(
         self,
-        retriever: AbsRetrieverBase,
+        retrieve_batch: RetrieveBatchFn,
         query_batch: Dict[str, List],
         dataset_name: str,
         top_k: int,
-        **kwargs,
     ) -> Tuple[List[RetrievalResultDataModel], float, float]:
         """
         Retrieves the top k results for each query in the batch using the specified retriever from a dataset.
 
         Parameters:
-            retriever (AbsRetrieverBase): The retriever for fetching the results.
+            retrieve_batch (RetrieveBatchFn): The retriever's batch retrieval function, as returned by `_bind_retrieve_batch`.
             query_batch (Dict[str, List]): A dictionary of list of queries for which results are to be retrieved.
             dataset_name (str): The name of the dataset to retrieve results from.
             top_k (int): The number of top results to retrieve for each query.
@@ -477,21 +634,7 @@ class AbsTask(ABC):
         """
         start_process_time = time.process_time()
         start_wall_clock_time = time.time()
-        if isinstance(retriever, StandardizedEmbRetr):
-            if CLIENT_KEY_NAME not in kwargs:
-                raise KeyError(f"missing kwarg {CLIENT_KEY_NAME}, required for standardized retriever")
-            retrieval_results = retriever.retrieve_batch(
-                queries=query_batch,
-                dataset_name=dataset_name,
-                top_k=top_k,
-                client=kwargs.get(CLIENT_KEY_NAME),
-            )
-        elif isinstance(retriever, CustomEmbRetr):
-            retrieval_results = retriever.retrieve_batch(queries=query_batch, dataset_name=dataset_name, top_k=top_k)
-        else:
-            raise ValueError(
-                f"retriever passed in doesn't inherit from the base retriever classes! (is of type {type(retriever)})"
-            )
+        retrieval_results = retrieve_batch(query_batch, dataset_name, top_k)
         end_process_time = time.process_time()
         end_wall_clock_time = time.time()
         process_duration = end_process_time - start_process_time
@@ -513,21 +656,26 @@ class AbsTask(ABC):
         Returns:
             None
         """
-        for idx in range(len(new_retrieval_results)):
-            gold_db_id: str = query_batch[DATABASE_ID_COL_NAME][idx]
-            gold_table_id: Union[str, List[str]] = query_batch[TABLE_ID_COL_NAME][idx]
-            retrieval_result = new_retrieval_results[idx]
+        # accumulate locally, the instance counters are only updated once per batch
+        num_overlap, total_tables, total_tables_capped = 0, 0, 0
+        for gold_db_id, gold_table_id, retrieval_result in zip(
+            query_batch[DATABASE_ID_COL_NAME],
+            query_batch[TABLE_ID_COL_NAME],
+            new_retrieval_results,
+        ):
             if not isinstance(gold_table_id, list):
                 # Treat all datasets (even single-table settings) as a list
                 gold_table_id = [gold_table_id]
-            normalized_gold_tables = set(
-                (gold_db_id, t) for t in gold_table_id
-            )  # E.g. {('soccer_3', 'club'), ('soccer_3', 'players')}
-            self.num_overlap += len(normalized_gold_tables.intersection(set(retrieval_result.retrieval_results)))
-            self.total_tables += len(normalized_gold_tables)
+            # E.g. {('soccer_3', 'club'), ('soccer_3', 'players')}
+            normalized_gold_tables = {(gold_db_id, t) for t in gold_table_id}
+            num_overlap += len(normalized_gold_tables & retrieval_result.retrieval_set)
+            total_tables += len(normalized_gold_tables)
             # Cap denominator at len(retrieval_result.retrieval_results) (aka `k`)
-            self.total_tables_capped += min(len(normalized_gold_tables), len(retrieval_result.retrieval_results))
-            self.total_queries_processed += 1
+            total_tables_capped += min(len(normalized_gold_tables), len(retrieval_result.retrieval_results))
+        self.num_overlap += num_overlap
+        self.total_tables += total_tables
+        self.total_tables_capped += total_tables_capped
+        self.total_queries_processed += len(new_retrieval_results)
 
     def _calculate_table_retrieval_performance(
         self,
@@ -571,12 +719,16 @@ class AbsTask(ABC):
             )
         else:
             raise ValueError("haven't processed any queries!")
+        return performace
 
+    def _reset_retrieval_metrics(self) -> None:
+        """
+        Reset the tracked retrieval metrics, called before running the task on a dataset.
+        """
         self.total_queries_processed = 0
         self.num_overlap = 0
         self.total_tables = 0
         self.total_tables_capped = 0
-        return performace
 
     @abstractmethod
     def _get_downstream_task_results(
@@ -614,6 +766,14 @@ class AbsTask(ABC):
         """
         pass
 
+    def _reset_downstream_task_metrics(self) -> None:
+        """
+        Reset the values tracked for the downstream task metrics. Tasks that track any values should override this.
+        Always assign new objects instead of clearing the existing ones in place, copies of the task made by
+        `_copy_with_new_metrics` would share them otherwise.
+        """
+        pass
+
     @abstractmethod
     def _calculate_downstream_task_performance(self, **kwargs) -> DownstreamTaskPerformanceDataModel:
         """
@@ -80,23 +80,22 @@ class FactVerificationTask(AbsTask):
         """
         Given the query and the retrieval results, generate downstream task results. Uses fact verification tasks's default generator to accept or refute the claim, or say there's not enough information.
         """
+        generated_results = self.task_generator.generate_batch(
+            [
+                (
+                    build_table_content_string(result.retrieval_results, table_id_to_table, self._table_str_cache),
+                    query_str,
+                )
+                for query_str, result in zip(query_batch[QUERY_COL_NAME], retrieval_results)
+            ]
+        )
         return [
             DownstreamGeneratedResultDataModel(
                 dataset_name=dataset_name,
                 query_id=query_id,
-                generated_results=self.task_generator.generate(
-                    table_str=build_table_content_string(
-                        result.retrieval_results,
-                        table_id_to_table,
-                    ),
-                    query=query_str,
-                )["content"],
-            )
-            for query_id, query_str, result in zip(
-                query_batch[QUERY_ID_COL_NAME],
-                query_batch[QUERY_COL_NAME],
-                retrieval_results,
+                generated_results=generated_result["content"],
             )
+            for query_id, generated_result in zip(query_batch[QUERY_ID_COL_NAME], generated_results)
         ]
 
     def _update_downstream_task_metrics(
@@ -154,6 +153,9 @@ class FactVerificationTask(AbsTask):
             }
         )
 
+        self._reset_downstream_task_metrics()
+        return result
+
+    def _reset_downstream_task_metrics(self) -> None:
         self.pred_answers = []
         self.ref_answers = []
-        return result
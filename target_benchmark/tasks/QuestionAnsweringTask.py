@@ -90,23 +90,22 @@ class QuestionAnsweringTask(AbsTask):
         currently just markdown reps of table strings
         All downstreams tasks should fill out this method. ideally uses the retrieval results to generate the downstream answer, and return the performance of the downstream generation.
         """
+        generated_results = self.task_generator.generate_batch(
+            [
+                (
+                    build_table_content_string(result.retrieval_results, table_id_to_table, self._table_str_cache),
+                    query_str,
+                )
+                for query_str, result in zip(query_batch[QUERY_COL_NAME], retrieval_results)
+            ]
+        )
         return [
             DownstreamGeneratedResultDataModel(
                 dataset_name=dataset_name,
                 query_id=query_id,
-                generated_results=self.task_generator.generate(
-                    table_str=build_table_content_string(
-                        result.retrieval_results,
-                        table_id_to_table,
-                    ),
-                    query=query_str,
-                )["content"],
-            )
-            for query_id, query_str, result in zip(
-                query_batch[QUERY_ID_COL_NAME],
-                query_batch[QUERY_COL_NAME],
-                retrieval_results,
+                generated_results=generated_result["content"],
             )
+            for query_id, generated_result in zip(query_batch[QUERY_ID_COL_NAME], generated_results)
         ]
 
     def _update_downstream_task_metrics(
@@ -145,6 +144,9 @@ class QuestionAnsweringTask(AbsTask):
 
         result = TableQATaskPerformanceDataModel(scores=scores)
 
+        self._reset_downstream_task_metrics()
+        return result
+
+    def _reset_downstream_task_metrics(self) -> None:
         self.pred_answers = []
         self.ref_answers = []
-        return result
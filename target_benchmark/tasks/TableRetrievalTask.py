@@ -18,6 +18,8 @@ from target_benchmark.tasks.TasksDataModels import DownstreamTaskPerformanceData
 class TableRetrievalTask(AbsTask):
     AVAILABLE_METRICS = set(["precision"])
     DEFAULT_METRICS = set(["precision"])
+    # no downstream generation, the table contents are never needed
+    NEEDS_TABLE_STRS = False
 
     def __init__(
         self,
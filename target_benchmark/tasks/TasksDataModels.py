@@ -79,6 +79,10 @@ class Text2SQLTaskPerformanceDataModel(DownstreamTaskPerformanceDataModel):
         default="Text to SQL Task",
         description="name of the downstream task",
     )
+    num_failed_generations: int = Field(
+        default=0,
+        description="number of queries whose sql generation failed, they're scored as wrong answers.",
+    )
 
 
 class TaskResultsDataModel(BaseModel):
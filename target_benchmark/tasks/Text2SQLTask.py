@@ -1,7 +1,19 @@
+import itertools
+import logging
 import sqlite3
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Dict, FrozenSet, Iterable, List, Tuple, Union
+
+from langchain_core.exceptions import OutputParserException
+from openai import (
+    APIConnectionError,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
 
 from target_benchmark.dataset_loaders.LoadersDataModels import DatasetConfigDataModel
 from target_benchmark.dataset_loaders.TargetDatasetConfig import TEXT_2_SQL_DATASETS
@@ -22,18 +34,58 @@ from target_benchmark.generators.GeneratorsDataModels import (
 from target_benchmark.retrievers.RetrieversDataModels import RetrievalResultDataModel
 from target_benchmark.tasks.AbsTask import AbsTask
 from target_benchmark.tasks.TasksDataModels import Text2SQLTaskPerformanceDataModel
-from target_benchmark.tasks.utils import evaluate_sql_execution
+from target_benchmark.tasks.utils import connect_read_only, evaluate_sql_execution
+
+logger = logging.getLogger(__name__)
+
+# errors that only fail the generation of the current batch: unparsable model outputs, requests the provider rejected
+# (e.g. too long prompts) or couldn't serve even after retrying. anything else (auth, bugs) ends the run.
+GENERATION_ERRORS = (
+    OutputParserException,
+    APIConnectionError,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
+
+
+# generated result of a query whose generation failed, it never matches the reference
+FAILED_GENERATION = {"sql_query": "", "database_id": ""}
 
 
 class Text2SQLTask(AbsTask):
     AVAILABLE_METRICS = set(["execution_accuracy", "execution_ves"])
     DEFAULT_METRICS = set(["execution_accuracy"])
+    # prompts are built from the sqlite schemas, not from the table contents
+    NEEDS_TABLE_STRS = False
+    # slots for the attributes read in the per batch loops. `AbsTask` has no slots, so instances keep their `__dict__`
+    __slots__ = (
+        "include_ves",
+        "concurrency",
+        "num_workers",
+        "compact_schema",
+        "pred_sql",
+        "ref_sql",
+        "num_failed_generations",
+        "difficulties",
+        "current_dataset",
+        "database_dirs",
+        "_schema_cache",
+        "_table_schemas_cache",
+        "_retrieved_schemas_cache",
+        "_conn_cache",
+        "_conn_lock",
+        "_schema_executor",
+    )
 
     def __init__(
         self,
         datasets_config: Dict[str, Dict[str, str]] = None,
         task_generator: AbsGenerator = None,
         metrics: Union[str, List[str]] = list(DEFAULT_METRICS),
+        concurrency: int = 16,
+        num_workers: int = 1,
+        compact_schema: bool = False,
         **kwargs,
     ):
         if task_generator is None:
@@ -48,20 +100,46 @@ class Text2SQLTask(AbsTask):
         if isinstance(metrics, str):
             metrics = [metrics]
 
-        for metric in metrics:
-            if metric not in Text2SQLTask.AVAILABLE_METRICS:
-                raise ValueError(f"the metric {metric} is not one of the available metrics!")
-        self.include_ves = False
-        if "execution_ves" in metrics:
-            self.include_ves = True
+        metrics = set(metrics)
+        unavailable_metrics = metrics - Text2SQLTask.AVAILABLE_METRICS
+        if unavailable_metrics:
+            raise ValueError(f"the metrics {sorted(unavailable_metrics)} are not among the available metrics!")
+        self.include_ves = "execution_ves" in metrics
+        if concurrency < 1:
+            raise ValueError(f"concurrency needs to be at least 1, got {concurrency}.")
+        # caps the sql generations in flight at once, 1 generates sequentially.
+        # the generator's own `max_concurrency` is never exceeded, generators only run concurrently if they opted in.
+        self.concurrency = concurrency
+        if num_workers < 1:
+            raise ValueError(f"num_workers needs to be at least 1, got {num_workers}.")
+        # number of processes executing the predicted & reference sqls during evaluation, defaults to 1 (serially).
+        # only used for execution accuracy, the execution times of VES aren't comparable when measured concurrently,
+        # so the sqls are always executed serially when `execution_ves` is computed.
+        self.num_workers = num_workers
+        # describe tables as `table(column:type, ...)` instead of their full `CREATE TABLE` statements.
+        # much shorter prompts, but primary & foreign keys are left out.
+        self.compact_schema = compact_schema
 
         # two lists, pred_sql contains the predicted sql queries,
         # and ref_sql contains the ground truth sql queries.
         self.pred_sql = []
         self.ref_sql = []
         self.difficulties = []
+        # queries of the current dataset whose generation failed, reported with the performance
+        self.num_failed_generations = 0
         self.current_dataset: str = None
         self.database_dirs: Dict[str, str] = None
+        # schema strings by (dataset name, database id, table ids), the databases don't change during a run
+        self._schema_cache: Dict[Tuple[str, str, FrozenSet[str]], str] = {}
+        # normalized `CREATE TABLE` statements by (dataset name, database id), then by table name
+        self._table_schemas_cache: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # joined schema strings by (dataset name, retrieved (database id, table id)s), for repeated retrieval results
+        self._retrieved_schemas_cache: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], str] = {}
+        # read only connections by (dataset name, database id), opened once & closed after each dataset
+        self._conn_cache: Dict[Tuple[str, str], sqlite3.Connection] = {}
+        self._conn_lock = threading.Lock()
+        # background thread reading the schemas of a batch's retrieved databases, started on the first batch
+        self._schema_executor: ThreadPoolExecutor = None
 
     @classmethod
     def get_default_task_name(cls) -> str:
@@ -148,14 +226,88 @@ class Text2SQLTask(AbsTask):
         """
         if dataset_name not in self.database_dirs:
             raise ValueError(f"dataset {dataset_name} does not have a database directory setup.")
+        return self._get_cached_schema(dataset_name, db_id, table_ids)
+
+    def _get_cached_schema(self, dataset_name: str, db_id: str, table_ids: List[str]) -> str:
+        """
+        `_get_schema` without checking the database directory of the dataset, for callers that checked it already.
+        """
         if db_id == "":
             return NO_CONTEXT_TABLE_PROMPT
-        db_path = Path(self.database_dirs[dataset_name], db_id, f"{db_id}.sqlite")
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        # Fetch and print the schema of each table
-        table_schemas = cur.execute(f"SELECT name, sql FROM sqlite_schema WHERE type='table' AND name IN ({','.join('?' * len(table_ids))})", table_ids).fetchall()
-        schema_str = f"\nDatabase Name: {db_id}\nSchema:"
+        # the order of the table ids doesn't matter, sqlite returns the schemas in its own order
+        cache_key = (dataset_name, db_id, frozenset(table_ids))
+        schema_str = self._schema_cache.get(cache_key)
+        if schema_str is None:
+            schema_str = self._fetch_schema(dataset_name, db_id, table_ids)
+            self._schema_cache[cache_key] = schema_str
+        return schema_str
+
+    def _get_connection(self, dataset_name: str, db_id: str) -> sqlite3.Connection:
+        key = (dataset_name, db_id)
+        # schemas can be fetched from several threads, make sure each database is only opened once
+        with self._conn_lock:
+            conn = self._conn_cache.get(key)
+            if conn is None:
+                db_path = Path(self.database_dirs[dataset_name], db_id, f"{db_id}.sqlite")
+                # the schemas are only ever read, generation may run in other threads
+                conn = connect_read_only(db_path, check_same_thread=False)
+                # set up once per connection. no journal mode change, that needs write access to the database
+                conn.execute("PRAGMA temp_store=memory")
+                conn.execute("PRAGMA cache_size=-64000")
+                self._conn_cache[key] = conn
+        return conn
+
+    def close(self) -> None:
+        """
+        Closes the sqlite connections opened to read the database schemas. The task stays usable, connections are
+        reopened when needed.
+        """
+        if self._schema_executor is not None:
+            # waits for a schema read in progress, its connection is closed below
+            self._schema_executor.shutdown(wait=True)
+            self._schema_executor = None
+        with self._conn_lock:
+            for conn in self._conn_cache.values():
+                conn.close()
+            self._conn_cache = {}
+
+    def __del__(self):
+        # the attributes may not exist if the constructor raised
+        if getattr(self, "_schema_executor", None) is not None:
+            self._schema_executor.shutdown(wait=False)
+        for conn in getattr(self, "_conn_cache", {}).values():
+            conn.close()
+
+    def _fetch_schema(self, dataset_name: str, db_id: str, table_ids: List[str]) -> str:
+        table_schemas = self._table_schemas_cache.get((dataset_name, db_id))
+        if table_schemas is None:
+            table_schemas = self._prefetch_schemas(dataset_name, [db_id])[db_id]
+        # keep sqlite's order of the tables, not the order they were retrieved in
+        wanted_tables = set(table_ids)
+        parts = [f"\nDatabase Name: {db_id}\nSchema:"]
+        parts.extend(f"\n\n{schema}" for name, schema in table_schemas.items() if name in wanted_tables)
+        parts.append("\n\n---\n")
+        return "".join(parts)
+
+    def _read_table_schemas(self, dataset_name: str, db_id: str) -> Dict[str, str]:
+        """
+        Reads the normalized `CREATE TABLE` statements (or compact schemas) of all tables of a database with a single query.
+        """
+        cur = self._get_connection(dataset_name, db_id).cursor()
+        # rows are consumed straight from the cursor below, without a `fetchall` list in between
+        if self.compact_schema:
+            columns = cur.execute(
+                "SELECT m.name, p.name, p.type FROM sqlite_schema AS m JOIN pragma_table_info(m.name) AS p "
+                "WHERE m.type='table' ORDER BY m.rowid, p.cid"
+            )
+            table_columns: Dict[str, List[str]] = {}
+            for table_name, column_name, column_type in columns:
+                # sqlite allows columns without a declared type, those are listed by name only
+                column = f"{column_name}:{column_type}" if column_type else column_name
+                table_columns.setdefault(table_name, []).append(column)
+            return {name: f"{name}({', '.join(cols)})" for name, cols in table_columns.items()}
+
+        table_schemas = cur.execute("SELECT name, sql FROM sqlite_schema WHERE type='table'")
 
         def normalize_schema(schema: str) -> str:
             # Make sure our commas only come after newlines - not the inverse
@@ -166,9 +318,71 @@ class Text2SQLTask(AbsTask):
             schema = re.sub(r'\n(?=[^\)])', r'\n\t', schema)
             return schema
 
-        for _, schema in table_schemas:
-            schema_str += f"\n\n{normalize_schema(schema)}"
-        return schema_str + "\n\n---\n"
+        return {name: normalize_schema(schema) for name, schema in table_schemas}
+
+    def _prefetch_schemas(self, dataset_name: str, db_ids: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Reads the table schemas of the given databases that aren't cached yet, one query per database.
+        Databases are read concurrently when there's more than one to read.
+
+        Returns:
+            the table schemas of each of the given database ids, by table name.
+        """
+        db_ids = {db_id for db_id in db_ids if db_id != ""}
+        missing = [db_id for db_id in db_ids if (dataset_name, db_id) not in self._table_schemas_cache]
+        if missing and dataset_name not in self.database_dirs:
+            raise ValueError(f"dataset {dataset_name} does not have a database directory setup.")
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=min(16, len(missing))) as executor:
+                read_schemas = list(executor.map(lambda db_id: self._read_table_schemas(dataset_name, db_id), missing))
+        else:
+            read_schemas = [self._read_table_schemas(dataset_name, db_id) for db_id in missing]
+        for db_id, table_schemas in zip(missing, read_schemas):
+            self._table_schemas_cache[(dataset_name, db_id)] = table_schemas
+        return {db_id: self._table_schemas_cache[(dataset_name, db_id)] for db_id in db_ids}
+
+    def _generate_sqls(
+        self,
+        current_dataset: str,
+        retrieval_results: List[RetrievalResultDataModel],
+        query_strs: List[str],
+        schema_prefetch: Future,
+    ) -> List[Dict[str, str]]:
+        """
+        Builds the schema strings of the retrieved tables & generates a sql query for each of the queries.
+        `schema_prefetch` reads the schemas of the batch's databases, it's waited for before the first schema is needed.
+        """
+        get_schema = self._get_cached_schema
+        # First, aggregate together all table_ids coming from the same db_id
+        results_db_id_to_tables: List[Dict[str, List[str]]] = []
+        for result in retrieval_results:
+            db_id_to_tables: Dict[str, List[str]] = {}
+            for db_id, table_id in result.retrieval_results:
+                db_id_to_tables.setdefault(db_id, []).append(table_id)
+            results_db_id_to_tables.append(db_id_to_tables)
+        # the schemas of all databases of the batch are read up front, one query per database
+        schema_prefetch.result()
+
+        # Next, serialize the schema of those tables to a string, before any generation happens
+        retrieved_schemas = self._retrieved_schemas_cache
+        table_strs = []
+        for result, db_id_to_tables in zip(retrieval_results, results_db_id_to_tables):
+            cache_key = (current_dataset, tuple(map(tuple, result.retrieval_results)))
+            table_str = retrieved_schemas.get(cache_key)
+            if table_str is None:
+                table_str = "".join(
+                    get_schema(current_dataset, db_id, table_ids) for db_id, table_ids in db_id_to_tables.items()
+                )
+                retrieved_schemas[cache_key] = table_str
+            table_strs.append(table_str)
+        # queries asked twice over the same tables only need one generation
+        pair_indices: Dict[Tuple[str, str], int] = {}
+        pair_idx_of_query = [pair_indices.setdefault(pair, len(pair_indices)) for pair in zip(table_strs, query_strs)]
+        # a failed request only fails its own queries, it gets its exception in place of the generated sql
+        unique_generated_sqls = self.task_generator.generate_batch(
+            list(pair_indices), max_concurrency=self.concurrency, return_exceptions=True
+        )
+        return [unique_generated_sqls[pair_idx] for pair_idx in pair_idx_of_query]
 
     def _get_downstream_task_results(
         self,
@@ -182,41 +396,48 @@ class Text2SQLTask(AbsTask):
         """
         if not self.current_dataset:
             self.current_dataset = dataset_name
-
-        downstream_task_results = []
-        for query_id, query_str, result in zip(
-            query_batch[QUERY_ID_COL_NAME],
-            query_batch[QUERY_COL_NAME],
-            retrieval_results,
-        ):
-            # First, aggregate together all table_ids coming from the same db_id
-            db_id_to_tables: Dict[str, List[str]] = {}
-            for db_id, table_id in result.retrieval_results:
-                if db_id not in db_id_to_tables:
-                    db_id_to_tables[db_id] = []
-                db_id_to_tables[db_id].append(table_id)
-            # Next, serialize the schema of those tables to a string
-            table_str = ""
-            for db_id, table_ids in db_id_to_tables.items():
-                table_str += self._get_schema(
-                    dataset_name=self.current_dataset,
-                    db_id=db_id,
-                    table_ids=table_ids
-                )
-            generated_sql = self.task_generator.generate(
-                table_str=table_str,
-                query=query_str,
+        # bind the dataset & the columns once
+        current_dataset = self.current_dataset
+        if current_dataset not in self.database_dirs:
+            raise ValueError(f"dataset {current_dataset} does not have a database directory setup.")
+        query_ids = query_batch[QUERY_ID_COL_NAME]
+        query_strs = query_batch[QUERY_COL_NAME]
+
+        # start reading the schemas of the retrieved databases right away, the prompts are prepared in the meantime
+        if self._schema_executor is None:
+            self._schema_executor = ThreadPoolExecutor(max_workers=1)
+        batch_db_ids = {db_id for result in retrieval_results for db_id, _ in result.retrieval_results}
+        schema_prefetch = self._schema_executor.submit(self._prefetch_schemas, current_dataset, batch_db_ids)
+        try:
+            generated_sqls = self._generate_sqls(current_dataset, retrieval_results, query_strs, schema_prefetch)
+        except GENERATION_ERRORS as e:
+            # generators that raise for the whole batch anyway
+            generated_sqls = [e] * len(query_ids)
+        # a failing generation doesn't end the run, its queries are scored as failed instead
+        failed_query_ids, errors = [], []
+        for idx, (query_id, generated_sql) in enumerate(zip(query_ids, generated_sqls)):
+            if isinstance(generated_sql, Exception):
+                if not isinstance(generated_sql, GENERATION_ERRORS):
+                    raise generated_sql
+                failed_query_ids.append(query_id)
+                errors.append(generated_sql)
+                generated_sqls[idx] = FAILED_GENERATION
+        if failed_query_ids:
+            self.num_failed_generations += len(failed_query_ids)
+            logger.warning(
+                "failed to generate sqls on dataset %s for queries %s: %r", current_dataset, failed_query_ids, errors[0]
             )
-            downstream_task_results.append(
-                DownstreamGeneratedResultDataModel(
-                    dataset_name=dataset_name,
-                    query_id=query_id,
-                    generated_results=(
-                        generated_sql["sql_query"],
-                        generated_sql["database_id"],
-                    ),
+        downstream_task_results = [
+            DownstreamGeneratedResultDataModel(
+                dataset_name=dataset_name,
+                query_id=query_id,
+                generated_results=(
+                    generated_sql["sql_query"],
+                    generated_sql["database_id"],
                 ),
             )
+            for query_id, generated_sql in zip(query_ids, generated_sqls)
+        ]
 
         return downstream_task_results
 
@@ -231,13 +452,13 @@ class Text2SQLTask(AbsTask):
         based on the predicted answers in downstream_results and ground truth answers in query_batch.
         """
 
-        for downstream_answer in downstream_results:
-            self.pred_sql.append(downstream_answer.generated_results)
-        self.ref_sql.extend(list(zip(query_batch[ANSWER_COL_NAME], query_batch[DATABASE_ID_COL_NAME])))
+        # extend straight from the iterators, no intermediate lists
+        self.pred_sql.extend(downstream_answer.generated_results for downstream_answer in downstream_results)
+        self.ref_sql.extend(zip(query_batch[ANSWER_COL_NAME], query_batch[DATABASE_ID_COL_NAME]))
         if DIFFICULTY_COL_NAME in query_batch:
             self.difficulties.extend(query_batch[DIFFICULTY_COL_NAME])
         else:
-            self.difficulties.extend(["Default"] * len(downstream_results))
+            self.difficulties.extend(itertools.repeat("Default", len(downstream_results)))
 
     def _calculate_downstream_task_performance(self, **kwargs) -> Text2SQLTaskPerformanceDataModel:
         """
@@ -249,20 +470,35 @@ class Text2SQLTask(AbsTask):
         if self.current_dataset not in self.database_dirs:
             raise ValueError(f"{self.current_dataset} does not have path to database files.")
         db_path = self.database_dirs[self.current_dataset]
+        # stop the schema reads & close their connections, evaluation forks processes which shouldn't inherit them
+        self.close()
+        # no point in starting more processes than there are sql pairs to execute
+        num_workers = 1 if self.include_ves else max(1, min(self.num_workers, len(self.pred_sql)))
         result = Text2SQLTaskPerformanceDataModel(
             scores=evaluate_sql_execution(
                 self.pred_sql,
                 self.ref_sql,
                 self.difficulties,
                 db_path,
-                1,
+                num_workers,
                 60,
                 self.include_ves,
-            )
+            ),
+            num_failed_generations=self.num_failed_generations,
         )
 
+        self._reset_downstream_task_metrics()
+        return result
+
+    def _reset_downstream_task_metrics(self) -> None:
         self.pred_sql = []
         self.ref_sql = []
         self.difficulties = []
+        self.num_failed_generations = 0
         self.current_dataset = None
-        return result
+        self._schema_cache = {}
+        self._table_schemas_cache = {}
+        self._retrieved_schemas_cache = {}
+        # the connections of the previous dataset are closed by `close`, copies share them otherwise
+        self._conn_cache = {}
+        self._schema_executor = None
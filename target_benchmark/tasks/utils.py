@@ -2,11 +2,13 @@ import json
 import math
 import multiprocessing as mp
 import os
+import queue
 import sqlite3
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Dict, Generator, List, Tuple, Union
+from typing import Dict, Generator, Iterable, List, Tuple, Union
 
 import numpy as np
 from func_timeout import FunctionTimedOut, func_timeout
@@ -26,13 +28,24 @@ from target_benchmark.retrievers.utils import markdown_table_str
 def build_table_content_string(
     retrieval_results: List[Tuple[str, str]],
     table_id_to_table: Dict[Tuple[str, str], List[List]],
+    table_str_cache: Dict[Tuple[str, str], str] = None,
 ) -> str:
+    """
+    Joins the markdown representations of the retrieved tables. If a `table_str_cache` dictionary is passed in,
+    each table is only converted to markdown the first time it is retrieved, later lookups reuse the cached string.
+    """
     tables = set()
     for retrieved_table_id in retrieval_results:
         if retrieved_table_id not in table_id_to_table:
             return NO_CONTEXT_TABLE_PROMPT
-        else:
+        if table_str_cache is None:
             tables.add(markdown_table_str(table_id_to_table[retrieved_table_id]))
+            continue
+        table_str = table_str_cache.get(retrieved_table_id)
+        if table_str is None:
+            table_str = markdown_table_str(table_id_to_table[retrieved_table_id])
+            table_str_cache[retrieved_table_id] = table_str
+        tables.add(table_str)
     return "\n".join(table_content for table_content in tables)
 
 
@@ -106,6 +119,54 @@ def generate_batches_from_file(
             yield loaded_models
 
 
+_PREFETCH_DONE = object()
+
+
+def prefetch(iterable: Iterable, num_prefetched: int = 2) -> Generator:
+    """
+    Iterates over `iterable` in a background thread, keeping up to `num_prefetched` items ready
+    while the consumer is still busy with the current one. Exceptions raised by the iterable are re-raised to the consumer.
+    If the consumer stops early (break or close), the background thread stops as well.
+    """
+    buffer = queue.Queue(maxsize=num_prefetched)
+    stopped = threading.Event()
+
+    def put(entry) -> bool:
+        # a full buffer must not block forever once the consumer is gone
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            # also KeyboardInterrupt & co, the consumer would wait on the buffer forever otherwise
+            put((_PREFETCH_DONE, e))
+        else:
+            put((_PREFETCH_DONE, None))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is _PREFETCH_DONE:
+                return
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
 def find_resume_indices(
     dataset_loaders: Dict[str, AbsDatasetLoader],
     path_to_results: Union[Path, None] = None,
@@ -130,6 +191,18 @@ def clean_abnormal(input):
     return processed_list
 
 
+def connect_read_only(db_path: Union[str, Path], **kwargs) -> sqlite3.Connection:
+    """
+    Opens a sqlite database that isn't written to while it's open. `immutable` skips locking & the journal files,
+    and the database is memory mapped so connections to the same file share the os page cache.
+    kwargs are passed on to `sqlite3.connect`.
+    """
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1", uri=True, **kwargs)
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
 def execute_sql(sql, cursor):
     start_time = time.time()
     cursor.execute(sql)
@@ -151,10 +224,10 @@ def iterated_execute_sql(
     ground_truth, ground_truth_db = ground_truth_sql_and_db
     # given a predicted sql, ground truth sql,
     # and the respective db paths of each, get efficiency results.
-    pred_conn = sqlite3.connect(os.path.join(db_root_path, predicted_db, f"{predicted_db}.sqlite"))
+    pred_conn = connect_read_only(os.path.join(db_root_path, predicted_db, f"{predicted_db}.sqlite"))
     pred_cursor = pred_conn.cursor()
 
-    gt_conn = sqlite3.connect(os.path.join(db_root_path, ground_truth_db, f"{ground_truth_db}.sqlite"))
+    gt_conn = connect_read_only(os.path.join(db_root_path, ground_truth_db, f"{ground_truth_db}.sqlite"))
     gt_cursor = gt_conn.cursor()
 
     diff_list = []
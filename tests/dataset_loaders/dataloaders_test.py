@@ -1,8 +1,14 @@
 import unittest
+from unittest.mock import MagicMock, patch
 
 from target_benchmark.dataset_loaders import HFDatasetLoader
 from target_benchmark.dataset_loaders.AbsDatasetLoader import QueryType
+from target_benchmark.dataset_loaders.HFDatasetLoader import invalidate_cache
+from target_benchmark.dataset_loaders.NeedleInHaystackDataLoader import (
+    NeedleInHaystackDataLoader,
+)
 from target_benchmark.dataset_loaders.TargetDatasetConfig import (
+    DEFAULT_GITTABLES_DATASET_CONFIG,
     DEFAULT_TABFACT_DATASET_CONFIG,
 )
 
@@ -12,6 +18,58 @@ class DataloadersTest(unittest.TestCase):
         tabfact_loader = HFDatasetLoader(**DEFAULT_TABFACT_DATASET_CONFIG.model_dump())
         self.assertEqual(tabfact_loader.query_type, QueryType.FACT_VERIFICATION)
 
+    def test_nih_streaming(self):
+        config = DEFAULT_GITTABLES_DATASET_CONFIG.model_copy(update={"streaming": True, "num_proc": 4})
+        nih_loader = NeedleInHaystackDataLoader(**config.model_dump())
+        self.assertTrue(nih_loader.streaming)
+        self.assertEqual(nih_loader.query_type, QueryType.OTHER)
+
+        invalidate_cache()
+        with patch("target_benchmark.dataset_loaders.HFDatasetLoader.load_dataset", return_value=MagicMock()) as load:
+            nih_loader.load()
+        invalidate_cache()
+        load.assert_called_once()
+        self.assertEqual(load.call_args.kwargs["path"], "target-benchmark/gittables-corpus")
+        self.assertTrue(load.call_args.kwargs["streaming"])
+        # streamed corpora aren't prepared up front, so no worker processes either
+        self.assertNotIn("num_proc", load.call_args.kwargs)
+
+    def test_table_id_to_table_memoized_per_corpus(self):
+        tabfact_loader = HFDatasetLoader(**DEFAULT_TABFACT_DATASET_CONFIG.model_dump())
+        entries = [{"database_id": [0], "table_id": ["t1"], "table": [[["a"], ["1"]]], "context": [{}]}]
+
+        invalidate_cache()
+        # every download is a new corpus object
+        load_patch = patch("target_benchmark.dataset_loaders.HFDatasetLoader.load_dataset", side_effect=lambda **_: MagicMock())
+        convert_patch = patch.object(tabfact_loader, "convert_corpus_table_to", side_effect=lambda: iter(entries))
+        with load_patch as load, convert_patch as convert:
+            tabfact_loader.load()
+            mapping = tabfact_loader.get_table_id_to_table()
+            self.assertEqual(mapping, {("0", "t1"): [["a"], ["1"]]})
+            # a second call reuses the mapping without converting the corpus again
+            self.assertIs(tabfact_loader.get_table_id_to_table(), mapping)
+            self.assertEqual(convert.call_count, 1)
+
+            # reloading hits the dataset cache, same corpus object, same mapping
+            tabfact_loader.corpus = None
+            tabfact_loader.load()
+            self.assertIs(tabfact_loader.get_table_id_to_table(), mapping)
+            self.assertEqual(convert.call_count, 1)
+
+            # after invalidating the cache the reload gets a new corpus object & the mapping is rebuilt
+            invalidate_cache()
+            tabfact_loader.corpus = None
+            tabfact_loader.queries = None
+            tabfact_loader.load()
+            self.assertEqual(load.call_count, 4)
+            self.assertIsNot(tabfact_loader.get_table_id_to_table(), mapping)
+            self.assertEqual(convert.call_count, 2)
+
+            # so is assigning a new corpus directly
+            tabfact_loader.corpus = MagicMock()
+            tabfact_loader.get_table_id_to_table()
+            self.assertEqual(convert.call_count, 3)
+        invalidate_cache()
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,10 @@
+import threading
 import unittest
+from unittest.mock import patch
 
+from langchain_core.messages import AIMessage
+
+from target_benchmark.generators.AbsGenerator import AbsGenerator
 from target_benchmark.generators.DefaultGenerator import DefaultGenerator
 from target_benchmark.generators.Text2SQLGenerator import Text2SQLGenerator
 
@@ -22,6 +27,73 @@ class TestEvaluator(unittest.TestCase):
         self.assertIn("content", answer)
         self.assertIn("75,000", answer["content"])
 
+    def test_generate_batch(self):
+        table_str = """
+| Employee ID | Name       | Department  | Salary |
+|-------------|------------|-------------|--------|
+| 1           | Alice Smith| Marketing   | $60,000|
+| 2           | Bob Johnson| Sales       | $55,000|
+        """
+        pairs = [
+            (table_str, "What's the salary of Alice Smith?"),
+            (table_str, "What's the salary of Bob Johnson?"),
+        ]
+        # no live llm calls, the batched chain returns canned chat messages in the order of the pairs
+        with patch.object(
+            self.dg,
+            "_batch_chain",
+            return_value=[AIMessage(content="Alice Smith earns $60,000."), AIMessage(content="Bob Johnson earns $55,000.")],
+        ) as mock_batch_chain:
+            answers = self.dg.generate_batch(pairs, max_concurrency=4)
+        mock_batch_chain.assert_called_once_with(pairs, 4)
+        self.assertEqual(len(answers), 2)
+        self.assertIn("60,000", answers[0]["content"])
+        self.assertIn("55,000", answers[1]["content"])
+
+    def test_generate_batch_retries_like_generate(self):
+        pairs = [("| a |", "first?"), ("| b |", "second?")]
+        # the batch goes through `_invoke_chain`, so each request gets its retry & backoff
+        with patch.object(
+            self.dg, "_invoke_chain", side_effect=lambda table_str, query: AIMessage(content=f"{table_str} {query}")
+        ) as mock_invoke_chain:
+            answers = self.dg.generate_batch(pairs, max_concurrency=2)
+        self.assertEqual(mock_invoke_chain.call_count, 2)
+        self.assertEqual(answers, [{"content": "| a | first?"}, {"content": "| b | second?"}])
+
+    def test_generate_batch_calls_overridden_generate(self):
+        class ShoutingGenerator(DefaultGenerator):
+            def generate(self, table_str: str, query: str):
+                return {"content": query.upper()}
+
+        generator = ShoutingGenerator()
+        with patch.object(generator, "_batch_chain") as mock_batch_chain:
+            answers = generator.generate_batch([("| a |", "first?"), ("| b |", "second?")])
+        mock_batch_chain.assert_not_called()
+        self.assertEqual(answers, [{"content": "FIRST?"}, {"content": "SECOND?"}])
+
+    def test_generate_batch_sequential_by_default(self):
+        class RecordingGenerator(AbsGenerator):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.threads = set()
+
+            def generate(self, table_str: str, query: str) -> str:
+                self.threads.add(threading.get_ident())
+                return query
+
+        pairs = [("", str(i)) for i in range(8)]
+        generator = RecordingGenerator()
+        # a task asking for more concurrency doesn't make a generator that didn't opt in run concurrently
+        self.assertEqual(generator.generate_batch(pairs, max_concurrency=4), [str(i) for i in range(8)])
+        self.assertEqual(generator.threads, {threading.get_ident()})
+
+        generator = RecordingGenerator(max_concurrency=4)
+        self.assertEqual(generator.generate_batch(pairs), [str(i) for i in range(8)])
+        self.assertNotIn(threading.get_ident(), generator.threads)
+
+        with self.assertRaises(ValueError):
+            RecordingGenerator(max_concurrency=0)
+
     def test_text2sql_generator(self):
         table_str = """Table Name: perpetrator
  Schema:
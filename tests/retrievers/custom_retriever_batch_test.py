@@ -0,0 +1,42 @@
+import unittest
+
+from target_benchmark.dictionary_keys import QUERY_COL_NAME, QUERY_ID_COL_NAME
+from target_benchmark.retrievers import AbsCustomEmbeddingRetriever
+
+TOY_DATASET_NAME = "toy"
+
+
+class ToyRetriever(AbsCustomEmbeddingRetriever):
+    def __init__(self, results):
+        super().__init__()
+        self.results = results
+
+    def retrieve(self, query: str, dataset_name: str, top_k: int, **kwargs):
+        return self.results[query]
+
+    def embed_corpus(self, dataset_name, corpus):
+        pass
+
+
+class TestCustomRetrieverBatch(unittest.TestCase):
+    def retrieve_batch(self, results):
+        queries = {QUERY_COL_NAME: list(results), QUERY_ID_COL_NAME: list(range(len(results)))}
+        return ToyRetriever(results).retrieve_batch(queries, TOY_DATASET_NAME, top_k=2)
+
+    def test_results_coerced_to_tuples(self):
+        results = self.retrieve_batch({"q0": [["db", "t1"], ("db", "t2")], "q1": []})
+        self.assertEqual([result.query_id for result in results], [0, 1])
+        self.assertEqual(results[0].retrieval_results, [("db", "t1"), ("db", "t2")])
+        self.assertEqual(results[0].retrieval_set, frozenset({("db", "t1"), ("db", "t2")}))
+        self.assertEqual(results[1].retrieval_results, [])
+
+    def test_malformed_results_rejected(self):
+        # a bare id would otherwise become a tuple of its characters
+        with self.assertRaisesRegex(TypeError, "query 1"):
+            self.retrieve_batch({"q0": [("db", "t1")], "q1": ["t1"]})
+        with self.assertRaisesRegex(TypeError, "query 0"):
+            self.retrieve_batch({"q0": "t1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
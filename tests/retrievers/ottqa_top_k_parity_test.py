@@ -0,0 +1,79 @@
+import ast
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+from target_benchmark.dictionary_keys import QUERY_COL_NAME, QUERY_ID_COL_NAME
+from target_benchmark.retrievers.ottqa.OTTQARetriever import OTTQARetriever, top_k_order
+from target_benchmark.retrievers.ottqa.drqa.retriever import TfidfDocRanker
+
+TOY_DATASET_NAME = "toy"
+HASH_SIZE = 4
+
+# term weights (rows) of each doc (columns). docs 0, 1, 3 & 5 tie on term 0, docs 2 & 4 tie on term 1.
+DOC_MAT = np.array(
+    [
+        [1.0, 1.0, 0.0, 1.0, 0.0, 1.0],
+        [0.0, 0.0, 2.0, 0.5, 2.0, 0.0],
+        [0.0, 0.0, 0.0, 0.0, 0.0, 3.0],
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    ]
+)
+
+QUERY_VECS = {
+    "all ties": [1.0, 0.0, 0.0, 0.0],
+    "mixed": [1.0, 1.0, 0.0, 0.0],
+    "two docs tie": [0.0, 1.0, 0.0, 0.0],
+    "single doc": [0.0, 0.0, 1.0, 0.0],
+    "no doc": [0.0, 0.0, 0.0, 1.0],
+}
+
+
+class TestOTTQATopKParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        doc_ids = [str(("toy_db", f"table_{i}")) for i in range(DOC_MAT.shape[1])]
+        # a tf-idf ranker over a hand made doc matrix, the query vectors stand in for the hashed & weighted ngrams
+        cls.ranker = TfidfDocRanker.__new__(TfidfDocRanker)
+        cls.ranker.doc_mat = sp.csr_matrix(DOC_MAT)
+        cls.ranker.doc_dict = ({doc_id: i for i, doc_id in enumerate(doc_ids)}, doc_ids)
+        cls.ranker.num_docs = len(doc_ids)
+        cls.ranker.hash_size = HASH_SIZE
+        cls.ranker.text2spvec = lambda query: sp.csr_matrix(np.array([QUERY_VECS[query]]))
+
+        cls.retriever = OTTQARetriever()
+        cls.retriever.rankers[TOY_DATASET_NAME] = cls.ranker
+        cls.retriever.doc_tuples[TOY_DATASET_NAME] = [ast.literal_eval(doc_id) for doc_id in doc_ids]
+
+    def closest_doc_tuples(self, query: str, top_k: int):
+        doc_ids, _ = self.ranker.closest_docs(query, k=top_k)
+        return [ast.literal_eval(doc_id) for doc_id in doc_ids]
+
+    def test_retrieve_batch_matches_closest_docs(self):
+        queries = {
+            QUERY_COL_NAME: list(QUERY_VECS),
+            QUERY_ID_COL_NAME: list(range(len(QUERY_VECS))),
+        }
+        # k below, at and above the number of docs (and the number of docs each query scores)
+        for top_k in [1, 2, 3, 4, DOC_MAT.shape[1], DOC_MAT.shape[1] + 4]:
+            results = self.retriever.retrieve_batch(queries, TOY_DATASET_NAME, top_k)
+            self.assertEqual([result.query_id for result in results], queries[QUERY_ID_COL_NAME])
+            for query, result in zip(queries[QUERY_COL_NAME], results):
+                expected = self.closest_doc_tuples(query, top_k)
+                self.assertEqual(result.retrieval_results, expected, f"query '{query}' with top_k={top_k}")
+                self.assertEqual(self.retriever.retrieve(query, TOY_DATASET_NAME, top_k), expected)
+
+    def test_top_k_order(self):
+        scores = np.array([0.5, 2.0, 1.0, 2.0, 0.5, 1.0, 3.0])
+        for top_k in range(1, len(scores) + 3):
+            order = top_k_order(scores, top_k)
+            self.assertEqual(len(order), min(top_k, len(scores)))
+            self.assertEqual(len(set(order.tolist())), len(order))
+            # best first, and exactly the top k scores (whichever of the tied positions is picked)
+            np.testing.assert_array_equal(scores[order], np.sort(scores)[::-1][:top_k])
+        self.assertEqual(len(top_k_order(np.array([]), 3)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
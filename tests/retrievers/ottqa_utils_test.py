@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from target_benchmark.retrievers.ottqa.utils import (
+    convert_table_representations,
+    get_filename,
+    hash_corpus_columns,
+    load_converted_corpus,
+    save_converted_corpus,
+)
+
+DATABASE_IDS = [0, 0, 1]
+TABLE_IDS = ["Table1", "Table2", "Table3"]
+HEADERS = [["name", "age"], ["city", "country"], ["team", "wins"]]
+CONTEXTS = [{"section_title": "people"}, {}, {"section_title": "sports"}]
+
+
+def batched(batch_size: int):
+    for start in range(0, len(TABLE_IDS), batch_size):
+        end = start + batch_size
+        yield DATABASE_IDS[start:end], TABLE_IDS[start:end], HEADERS[start:end], CONTEXTS[start:end]
+
+
+class TestOTTQAUtils(unittest.TestCase):
+    def test_corpus_hash_ignores_batching(self):
+        self.assertEqual(hash_corpus_columns(batched(1)), hash_corpus_columns(batched(2)))
+        self.assertEqual(hash_corpus_columns(batched(1)), hash_corpus_columns(batched(len(TABLE_IDS))))
+
+    def test_corpus_hash_changes_with_corpus(self):
+        changed_headers = [HEADERS[0], ["city", "population"], HEADERS[2]]
+        changed = [(DATABASE_IDS, TABLE_IDS, changed_headers, CONTEXTS)]
+        self.assertNotEqual(hash_corpus_columns(batched(len(TABLE_IDS))), hash_corpus_columns(changed))
+
+    def test_converted_corpus_round_trip(self):
+        section_titles = [context.get("section_title", "") for context in CONTEXTS]
+        converted_corpus = convert_table_representations(DATABASE_IDS, TABLE_IDS, HEADERS, section_titles, True)
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = Path(out_dir, "corpus.parquet")
+            save_converted_corpus(path, converted_corpus)
+            loaded_corpus = load_converted_corpus(path)
+        self.assertEqual(loaded_corpus, converted_corpus)
+        self.assertEqual(list(loaded_corpus), list(converted_corpus))
+        self.assertEqual(loaded_corpus["(0, 'Table1')"]["header"], ["name", "age"])
+
+    def test_changed_corpus_changes_index_file(self):
+        def index_file(column_batches):
+            return get_filename("out", "tfidf", False, 2, 2**24, "simple", "toy", hash_corpus_columns(column_batches))
+
+        changed_table_ids = ["Table1", "Table2", "Table4"]
+        self.assertEqual(index_file(batched(1)), index_file(batched(2)))
+        self.assertNotEqual(index_file(batched(1)), index_file([(DATABASE_IDS, changed_table_ids, HEADERS, CONTEXTS)]))
+        self.assertTrue(index_file(batched(1)).startswith(str(Path("out", "index-tfidf-False-ngram=2-"))))
+        self.assertTrue(index_file(batched(1)).endswith(f"-dataset=toy-corpus={hash_corpus_columns(batched(1))}.npz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
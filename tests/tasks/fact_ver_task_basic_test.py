@@ -23,7 +23,7 @@ class TestTableRetriever(unittest.TestCase):
     def setUp(self):
         self.mock_generator = MagicMock()
         self.mock_generator.__class__ = DefaultGenerator
-        self.mock_generator.generate.return_value = {"content": "True"}
+        self.mock_generator.generate_batch.return_value = [{"content": "True"}, {"content": "True"}]
 
         self.fact_ver = FactVerificationTask(task_generator=self.mock_generator)
 
@@ -97,7 +97,7 @@ class TestTableRetriever(unittest.TestCase):
             dataset_name="tabfact",
             top_k=2,
         )
-        self.mock_generator.generate.assert_called()
+        self.mock_generator.generate_batch.assert_called_once()
 
         self.assertTrue(isinstance(results["tabfact"].retrieval_performance, RetrievalPerformanceDataModel))
         retrieval_results = results["tabfact"].retrieval_performance.model_dump()
@@ -112,6 +112,92 @@ class TestTableRetriever(unittest.TestCase):
         self.assertEqual(downstream_scores["accuracy"], 0.5)
         self.assertEqual(downstream_scores["recall"], 0.5)
 
+    def test_fact_ver_task_run_multiple_datasets(self):
+        datasets_config = {
+            name: {
+                "hf_corpus_dataset_path": f"target-benchmark/{name}-corpus",
+                "hf_queries_dataset_path": f"target-benchmark/{name}-queries",
+                "query_type": "Fact Verification",
+            }
+            for name in ["tabfact", "tabfact-small"]
+        }
+
+        def retrieve_batch(queries, dataset_name, top_k):
+            return [
+                RetrievalResultDataModel(dataset_name=dataset_name, query_id=query_id, retrieval_results=[(0, table_id)])
+                for query_id, table_id in zip(queries["query_id"], ["Table1", "Table4"])
+            ]
+
+        def generate_batch(pairs, max_concurrency=None):
+            # answers depend on the prompt only, so the scores don't depend on the order of the calls
+            return [{"content": "True" if "temperature" in query else "False"} for _, query in pairs]
+
+        def make_loader(dataset_name, answers):
+            loader = MagicMock()
+            loader.dataset_name = dataset_name
+            loader.get_table_id_to_table.return_value = self.mock_dataset_loader.get_table_id_to_table.return_value
+            loader.get_queries_size.return_value = 2
+            loader.get_queries_for_task.side_effect = lambda batch_size: iter(
+                [
+                    {
+                        "query_id": [1, 2],
+                        "query": ["Jaylen Brown went to Stanford", "Today's temperature is in the low 20s."],
+                        "answer": answers,
+                        "table_id": ["Table1", "Table5"],
+                        "database_id": [0, 0],
+                    }
+                ],
+            )
+            return loader
+
+        def run(dataset_loaders, **run_kwargs):
+            generator = MagicMock()
+            generator.__class__ = DefaultGenerator
+            generator.generate_batch.side_effect = generate_batch
+            retriever = MagicMock()
+            retriever.__class__ = CustomEmbRetr
+            retriever.retrieve_batch.side_effect = retrieve_batch
+            task = FactVerificationTask(datasets_config=datasets_config, task_generator=generator)
+            return task, task.task_run(
+                retriever=retriever,
+                dataset_loaders=dataset_loaders,
+                logger=logger,
+                batch_size=2,
+                top_k=1,
+                **run_kwargs,
+            )
+
+        def make_loaders():
+            return {
+                "tabfact": make_loader("tabfact", ["False", "True"]),
+                "tabfact-small": make_loader("tabfact-small", ["True", "True"]),
+            }
+
+        # datasets only run concurrently when opted into
+        concurrent_task, concurrent_results = run(make_loaders(), max_concurrent_datasets=2)
+        serial_results = {}
+        for dataset_name, loader in make_loaders().items():
+            serial_task, results = run({dataset_name: loader})
+            serial_results.update(results)
+
+        self.assertEqual(set(concurrent_results), {"tabfact", "tabfact-small"})
+        for dataset_name, serial_result in serial_results.items():
+            concurrent_result = concurrent_results[dataset_name]
+            self.assertEqual(
+                concurrent_result.downstream_task_performance.model_dump(),
+                serial_result.downstream_task_performance.model_dump(),
+            )
+            for metric in ["k", "accuracy", "recall", "capped_recall"]:
+                self.assertEqual(
+                    getattr(concurrent_result.retrieval_performance, metric),
+                    getattr(serial_result.retrieval_performance, metric),
+                )
+        self.assertEqual(concurrent_results["tabfact"].downstream_task_performance.scores["accuracy"], 1.0)
+        self.assertEqual(concurrent_results["tabfact-small"].downstream_task_performance.scores["accuracy"], 0.5)
+        # like a serial run, the task is left with the retrieval metrics of the last dataset
+        self.assertEqual(concurrent_task.total_queries_processed, serial_task.total_queries_processed)
+        self.assertEqual(concurrent_task.num_overlap, serial_task.num_overlap)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import time
+import unittest
+
+from target_benchmark.tasks.utils import prefetch
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_keeps_order(self):
+        def slow_items():
+            for i in range(20):
+                # give the consumer a chance to overtake the producer
+                time.sleep(0.001 * (i % 3))
+                yield i
+
+        self.assertEqual(list(prefetch(slow_items(), num_prefetched=2)), list(range(20)))
+        self.assertEqual(list(prefetch([], num_prefetched=2)), [])
+
+    def test_producer_exception_is_reraised(self):
+        def failing_items():
+            yield 0
+            yield 1
+            raise ValueError("failed to load batch")
+
+        consumed = []
+        with self.assertRaisesRegex(ValueError, "failed to load batch"):
+            for item in prefetch(failing_items(), num_prefetched=2):
+                consumed.append(item)
+        # the items before the failure still reach the consumer
+        self.assertEqual(consumed, [0, 1])
+
+    def test_producer_base_exception_is_reraised(self):
+        def interrupted_items():
+            yield 0
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            list(prefetch(interrupted_items(), num_prefetched=2))
+
+    def test_early_break_stops_producer(self):
+        produced = []
+
+        def many_items():
+            for i in range(1000):
+                produced.append(i)
+                yield i
+
+        num_threads = threading.active_count()
+        for item in prefetch(many_items(), num_prefetched=2):
+            if item == 3:
+                break
+        # the producer thread is joined as soon as the consumer leaves the loop instead of blocking on the full buffer
+        self.assertEqual(threading.active_count(), num_threads)
+        self.assertLess(len(produced), 10)
+
+    def test_close_stops_producer(self):
+        num_threads = threading.active_count()
+        batches = prefetch(iter(range(1000)), num_prefetched=1)
+        self.assertEqual(next(batches), 0)
+        batches.close()
+        self.assertEqual(threading.active_count(), num_threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from target_benchmark.tasks.utils import (
+    connect_read_only,
+    execute_model,
+    iterated_execute_sql,
+)
+
+
+class TestSQLExecution(unittest.TestCase):
+    def setUp(self):
+        # <dir>/<db id>/<db id>.sqlite, like the text 2 sql datasets
+        self.database_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.database_dir.name, "music", "music.sqlite")
+        self.db_path.parent.mkdir()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE singer (singer_id int, name text)")
+        conn.executemany("INSERT INTO singer VALUES (?, ?)", [(1, "Ann"), (2, "Bo")])
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.database_dir.cleanup()
+
+    def test_connect_read_only_rejects_writes(self):
+        conn = connect_read_only(self.db_path)
+        self.assertEqual(conn.execute("SELECT count(*) FROM singer").fetchone(), (2,))
+        with self.assertRaises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO singer VALUES (3, 'Cy')")
+        with self.assertRaises(sqlite3.OperationalError):
+            conn.execute("DROP TABLE singer")
+        conn.close()
+        # the database is untouched
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("SELECT count(*) FROM singer").fetchone(), (2,))
+        conn.close()
+
+    def test_connect_read_only_missing_database(self):
+        missing_path = Path(self.database_dir.name, "missing", "missing.sqlite")
+        with self.assertRaises(sqlite3.OperationalError):
+            connect_read_only(missing_path)
+        # no empty database file is created in its place
+        self.assertFalse(missing_path.exists())
+        self.assertFalse(missing_path.parent.exists())
+
+    def test_execute_matching_sqls(self):
+        time_ratio, sql_execution_res = iterated_execute_sql(
+            ("SELECT name FROM singer ORDER BY name DESC", "music"),
+            ("SELECT name FROM singer", "music"),
+            self.database_dir.name,
+            iterate_num=1,
+        )
+        self.assertEqual(sql_execution_res, 1)
+        self.assertEqual(time_ratio, 0.0)
+
+    def test_execute_failed_generation(self):
+        # a failed generation is recorded as an empty sql on an empty database id
+        with self.assertRaises(sqlite3.OperationalError):
+            iterated_execute_sql(("", ""), ("SELECT name FROM singer", "music"), self.database_dir.name, iterate_num=1)
+        self.assertFalse(Path(self.database_dir.name, ".sqlite").exists())
+        # & scored as a wrong answer
+        result = execute_model(("", ""), ("SELECT name FROM singer", "music"), self.database_dir.name, 0, 1, 60.0)
+        self.assertEqual(result, {"sql_idx": 0, "time_ratio": 0, "sql_execution_res": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
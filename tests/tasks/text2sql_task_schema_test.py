@@ -0,0 +1,155 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from langchain_core.exceptions import OutputParserException
+
+from target_benchmark.generators import AbsGenerator, Text2SQLGenerator
+from target_benchmark.retrievers.RetrieversDataModels import RetrievalResultDataModel
+from target_benchmark.tasks.Text2SQLTask import Text2SQLTask
+
+TOY_DATASET_NAME = "toy"
+TOY_DATABASES = {
+    "music": [
+        "CREATE TABLE singer (singer_id int PRIMARY KEY, name text, age int)",
+        "CREATE TABLE concert (concert_id integer, singer_id integer, venue)",
+    ],
+    "school": [
+        "CREATE TABLE student (student_id int, name text)",
+    ],
+}
+
+
+def prompt_database(table_str: str) -> str:
+    # the schema string starts with "\nDatabase Name: <db id>\nSchema:"
+    return table_str.split("\n")[1][len("Database Name: ") :]
+
+
+class FlakySQLGenerator(AbsGenerator):
+    def generate(self, table_str: str, query: str):
+        if "fail" in query:
+            raise OutputParserException("could not parse the generated sql")
+        if "crash" in query:
+            raise ValueError("bug in the generator")
+        return {"sql_query": "SELECT count(*) FROM singer", "database_id": prompt_database(table_str)}
+
+
+class TestText2SQLSchemas(unittest.TestCase):
+    def setUp(self):
+        # a database directory laid out like the text 2 sql datasets: <dir>/<db id>/<db id>.sqlite
+        self.database_dir = tempfile.TemporaryDirectory()
+        for db_id, statements in TOY_DATABASES.items():
+            db_dir = Path(self.database_dir.name, db_id)
+            db_dir.mkdir()
+            conn = sqlite3.connect(db_dir / f"{db_id}.sqlite")
+            for statement in statements:
+                conn.execute(statement)
+            conn.commit()
+            conn.close()
+
+        self.mock_generator = MagicMock()
+        self.mock_generator.__class__ = Text2SQLGenerator
+        self.mock_generator.generate_batch.side_effect = lambda pairs, **kwargs: [
+            {"sql_query": f"SELECT '{query}'", "database_id": prompt_database(table_str)} for table_str, query in pairs
+        ]
+
+    def tearDown(self):
+        self.database_dir.cleanup()
+
+    def create_task(self, **kwargs) -> Text2SQLTask:
+        task = Text2SQLTask(task_generator=self.mock_generator, **kwargs)
+        task.database_dirs = {TOY_DATASET_NAME: self.database_dir.name}
+        task.current_dataset = TOY_DATASET_NAME
+        return task
+
+    def test_duplicate_queries_generated_once(self):
+        task = self.create_task()
+        queries = ["How many singers are there?", "Where are the concerts?", "How many singers are there?"] * 2
+        retrieved = [[("music", "singer")], [("music", "concert")], [("music", "singer")]] * 2
+        # the same question over another database is a different prompt
+        queries.append("How many singers are there?")
+        retrieved.append([("school", "student")])
+        query_batch = {"query_id": list(range(len(queries))), "query": queries}
+        retrieval_results = [
+            RetrievalResultDataModel(dataset_name=TOY_DATASET_NAME, query_id=query_id, retrieval_results=tables)
+            for query_id, tables in enumerate(retrieved)
+        ]
+
+        results = task._get_downstream_task_results(query_batch, retrieval_results, TOY_DATASET_NAME, {})
+        task.close()
+
+        # one generator call, with each distinct (schema, query) pair once & in the order first seen
+        self.mock_generator.generate_batch.assert_called_once()
+        pairs = self.mock_generator.generate_batch.call_args.args[0]
+        self.assertEqual(
+            [(prompt_database(table_str), query) for table_str, query in pairs],
+            [
+                ("music", "How many singers are there?"),
+                ("music", "Where are the concerts?"),
+                ("school", "How many singers are there?"),
+            ],
+        )
+        # the generated sqls fan back out to every query, in the original order
+        self.assertEqual([result.query_id for result in results], list(range(len(queries))))
+        self.assertEqual(
+            [result.generated_results for result in results],
+            [(f"SELECT '{query}'", tables[0][0]) for query, tables in zip(queries, retrieved)],
+        )
+
+    def test_failed_generations_scored_as_failed(self):
+        task = self.create_task()
+        task.task_generator = FlakySQLGenerator()
+        queries = ["How many singers are there?", "Please fail.", "Count the singers."]
+        query_batch = {
+            "query_id": [0, 1, 2],
+            "query": queries,
+            "answer": ["SELECT count(*) FROM singer"] * len(queries),
+            "database_id": ["music"] * len(queries),
+        }
+        retrieval_results = [
+            RetrievalResultDataModel(dataset_name=TOY_DATASET_NAME, query_id=query_id, retrieval_results=[("music", "singer")])
+            for query_id in query_batch["query_id"]
+        ]
+
+        results = task._get_downstream_task_results(query_batch, retrieval_results, TOY_DATASET_NAME, {})
+        # only the failed query gets the empty sql, the other generations are kept & stay aligned with their queries
+        self.assertEqual([result.query_id for result in results], [0, 1, 2])
+        self.assertEqual(
+            [result.generated_results for result in results],
+            [("SELECT count(*) FROM singer", "music"), ("", ""), ("SELECT count(*) FROM singer", "music")],
+        )
+        task._update_downstream_task_metrics(query_batch, results)
+        performance = task._calculate_downstream_task_performance()
+        self.assertEqual(performance.num_failed_generations, 1)
+        self.assertAlmostEqual(performance.scores["all"]["accuracy"], 2 / 3)
+        self.assertEqual(task.num_failed_generations, 0)
+
+        # anything but an expected generation error still ends the run
+        task.current_dataset = TOY_DATASET_NAME
+        with self.assertRaisesRegex(ValueError, "bug in the generator"):
+            task._get_downstream_task_results(
+                {"query_id": [3], "query": ["Please crash."]}, retrieval_results[:1], TOY_DATASET_NAME, {}
+            )
+        task.close()
+
+    def test_compact_schema(self):
+        task = self.create_task(compact_schema=True)
+        self.assertEqual(
+            task._read_table_schemas(TOY_DATASET_NAME, "music"),
+            {
+                "singer": "singer(singer_id:INT, name:TEXT, age:INT)",
+                # `venue` has no declared type, no dangling colon
+                "concert": "concert(concert_id:INTEGER, singer_id:INTEGER, venue)",
+            },
+        )
+        self.assertEqual(
+            task._get_schema(TOY_DATASET_NAME, "music", ["concert"]),
+            "\nDatabase Name: music\nSchema:\n\nconcert(concert_id:INTEGER, singer_id:INTEGER, venue)\n\n---\n",
+        )
+        task.close()
+
+
+if __name__ == "__main__":
+    unittest.main()